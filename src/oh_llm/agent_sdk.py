@@ -2,11 +2,16 @@ from __future__ import annotations
 
 import os
 import shutil
+import signal
 import subprocess
+import threading
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
+_CANCEL_POLL_S = 0.2
+
 
 class AgentSdkError(RuntimeError):
     pass
@@ -29,19 +34,36 @@ class AgentSdkInfo:
         }
 
 
+@lru_cache(maxsize=8)
+def _agent_sdk_path_for(env_path: str | None, home: str | None) -> Path:
+    if env_path:
+        return Path(env_path).expanduser()
+    return Path("~/repos/agent-sdk").expanduser()
+
+
 def resolve_agent_sdk_path(path: Path | None = None) -> Path:
     if path is not None:
         return path.expanduser()
+    return _agent_sdk_path_for(os.environ.get("OH_LLM_AGENT_SDK_PATH"), os.environ.get("HOME"))
 
-    env_path = os.environ.get("OH_LLM_AGENT_SDK_PATH")
-    if env_path:
-        return Path(env_path).expanduser()
 
-    return Path("~/repos/agent-sdk").expanduser()
+_WHICH_CACHE: dict[tuple[str, str | None], str] = {}
+
+
+def which_cached(name: str) -> str | None:
+    """`shutil.which`, memoized per `$PATH` value. Misses are not cached."""
+    key = (name, os.environ.get("PATH"))
+    resolved = _WHICH_CACHE.get(key)
+    if resolved is not None:
+        return resolved
+    resolved = shutil.which(name)
+    if resolved:
+        _WHICH_CACHE[key] = resolved
+    return resolved
 
 
 def uv_available() -> bool:
-    return shutil.which("uv") is not None
+    return which_cached("uv") is not None
 
 
 def _run_checked(args: list[str], *, cwd: Path | None = None) -> subprocess.CompletedProcess[str]:
@@ -116,7 +138,13 @@ def uv_run_python(
     agent_sdk_path: Path,
     python_args: list[str],
     env: dict[str, str] | None = None,
+    cancel: threading.Event | None = None,
 ) -> subprocess.CompletedProcess[str]:
+    """Run python inside the agent-sdk workspace.
+
+    When `cancel` is given, the process group is killed as soon as the event is set and the
+    returned process carries the kill's (negative on POSIX) return code.
+    """
     if not uv_available():
         raise AgentSdkError("`uv` not found on PATH; required to run agent-sdk workspace.")
 
@@ -125,13 +153,42 @@ def uv_run_python(
     if env:
         merged_env.update(env)
 
-    return subprocess.run(
-        ["uv", "--directory", str(agent_sdk_path), "run", "python", *python_args],
+    args = ["uv", "--directory", str(agent_sdk_path), "run", "python", *python_args]
+    if cancel is None:
+        return subprocess.run(
+            args,
+            env=merged_env,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+
+    # `uv run` starts python as a child process; a new session lets a cancel reach both.
+    proc = subprocess.Popen(
+        args,
         env=merged_env,
-        capture_output=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
         text=True,
-        check=False,
+        start_new_session=os.name == "posix",
     )
+    while True:
+        try:
+            stdout, stderr = proc.communicate(timeout=_CANCEL_POLL_S)
+            break
+        except subprocess.TimeoutExpired:
+            if not cancel.is_set():
+                continue
+            if os.name == "posix":
+                try:
+                    os.killpg(proc.pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+            else:
+                proc.kill()
+            stdout, stderr = proc.communicate()
+            break
+    return subprocess.CompletedProcess(args, proc.returncode, stdout, stderr)
 
 
 def looks_like_agent_sdk_checkout(path: Path) -> bool:
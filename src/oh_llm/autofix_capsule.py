@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+import hashlib
 import json
+import os
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+from oh_llm.fileio import write_private_text
 from oh_llm.redaction import Redactor
 
 
@@ -111,31 +114,19 @@ def write_capsule_artifacts(
     repro_script_path = artifacts_dir / "autofix_repro.py"
 
     capsule = build_capsule(run_dir=run_dir, run_record=run_record, redactor=redactor)
-    capsule_json_path.write_text(
-        json.dumps(capsule, indent=2, ensure_ascii=False) + "\n",
-        encoding="utf-8",
-    )
-    try:
-        capsule_json_path.chmod(0o600)
-    except OSError:
-        pass
+    write_private_text(capsule_json_path, json.dumps(capsule, indent=2, ensure_ascii=False) + "\n")
 
     # If a custom repro harness already exists (e.g. for debugging or tests), keep it.
     if not repro_script_path.exists():
-        repro_script_path.write_text(
-            _repro_script_text(run_dir=run_dir, run_record=run_record),
-            encoding="utf-8",
+        write_private_text(
+            repro_script_path, _repro_script_text(run_dir=run_dir, run_record=run_record)
         )
         try:
             repro_script_path.chmod(0o700)
         except OSError:
             pass
 
-    capsule_md_path.write_text(_capsule_md(capsule), encoding="utf-8")
-    try:
-        capsule_md_path.chmod(0o600)
-    except OSError:
-        pass
+    write_private_text(capsule_md_path, _capsule_md(capsule))
 
     return CapsuleArtifacts(
         capsule_json=capsule_json_path,
@@ -144,6 +135,101 @@ def write_capsule_artifacts(
     )
 
 
+def _stat_signature(digest: Any, paths: tuple[Path, ...]) -> None:
+    # By stat, to avoid re-reading files just to decide whether to rebuild.
+    for path in paths:
+        try:
+            st = path.stat()
+        except OSError:
+            digest.update(b"-")
+            continue
+        digest.update(f"{st.st_mtime_ns}:{st.st_size}".encode())
+
+
+def _capsule_inputs_digest(
+    *,
+    run_dir: Path,
+    run_record: dict[str, Any],
+    redactor: Redactor,
+    redaction_names: list[str],
+    salt: bytes,
+) -> str:
+    # Everything `build_capsule` reads: the run record, the redaction env names and the secret
+    # values they resolved to (so exporting a var later forces a re-redacted rebuild), and the
+    # log/probe files. Keyed with a per-stamp random salt so the stamp is no plain hash of secrets.
+    digest = hashlib.blake2b(digest_size=16, key=salt)
+    digest.update(json.dumps(run_record, sort_keys=True, default=str).encode("utf-8"))
+    digest.update("\0".join(sorted(redaction_names)).encode("utf-8"))
+    for value in sorted(redactor.secret_values):
+        digest.update(b"\0" + value.encode("utf-8"))
+    _stat_signature(
+        digest,
+        (run_dir / "logs" / "run.log", run_dir / "artifacts" / "stage_b_probe_result.json"),
+    )
+    return digest.hexdigest()
+
+
+def _capsule_outputs_digest(artifacts: CapsuleArtifacts) -> str:
+    # Catches the artifacts being rewritten (e.g. by `autofix capsule`) after the stamp was taken.
+    digest = hashlib.blake2b(digest_size=16)
+    _stat_signature(digest, (artifacts.capsule_json, artifacts.capsule_md, artifacts.repro_script))
+    return digest.hexdigest()
+
+
+def ensure_capsule_artifacts(
+    *,
+    run_dir: Path,
+    run_record: dict[str, Any],
+    redactor: Redactor,
+    redaction_names: list[str],
+) -> CapsuleArtifacts:
+    """Like `write_capsule_artifacts`, but reuse existing artifacts when their inputs match."""
+    artifacts_dir = run_dir / "artifacts"
+    stamp_path = artifacts_dir / "autofix_capsule.stamp"
+    artifacts = CapsuleArtifacts(
+        capsule_json=artifacts_dir / "autofix_capsule.json",
+        capsule_md=artifacts_dir / "autofix_capsule.md",
+        repro_script=artifacts_dir / "autofix_repro.py",
+    )
+    # Stamp format: "<salt> <inputs digest> <outputs digest>".
+    try:
+        current = stamp_path.read_text(encoding="utf-8").split()
+    except OSError:
+        current = []
+    if len(current) == 3:
+        try:
+            salt = bytes.fromhex(current[0])
+        except ValueError:
+            salt = b""
+        if salt:
+            inputs = _capsule_inputs_digest(
+                run_dir=run_dir,
+                run_record=run_record,
+                redactor=redactor,
+                redaction_names=redaction_names,
+                salt=salt,
+            )
+            if current[1:] == [inputs, _capsule_outputs_digest(artifacts)]:
+                return artifacts
+
+    # Drop the stamp before rebuilding and write it only once every artifact is in place, so an
+    # interrupted rebuild is never mistaken for a complete one.
+    stamp_path.unlink(missing_ok=True)
+    salt = os.urandom(16)
+    inputs = _capsule_inputs_digest(
+        run_dir=run_dir,
+        run_record=run_record,
+        redactor=redactor,
+        redaction_names=redaction_names,
+        salt=salt,
+    )
+    artifacts = write_capsule_artifacts(run_dir=run_dir, run_record=run_record, redactor=redactor)
+    write_private_text(
+        stamp_path, f"{salt.hex()} {inputs} {_capsule_outputs_digest(artifacts)}\n"
+    )
+    return artifacts
+
+
 def _repro_script_text(*, run_dir: Path, run_record: dict[str, Any]) -> str:
     # This script is meant to be executed under the agent-sdk uv environment:
     #   uv --directory "$OH_LLM_AGENT_SDK_PATH" run python autofix_repro.py --stage a
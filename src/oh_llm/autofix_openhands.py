@@ -2,7 +2,6 @@ from __future__ import annotations
 
 import json
 import os
-import shutil
 import subprocess
 import time
 from dataclasses import dataclass
@@ -10,7 +9,7 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
-from oh_llm.agent_sdk import AgentSdkError
+from oh_llm.agent_sdk import AgentSdkError, which_cached
 from oh_llm.redaction import Redactor
 
 
@@ -50,7 +49,7 @@ def resolve_openhands_bin(value: str) -> str:
     if os.sep in value or (os.altsep and os.altsep in value):
         return value
 
-    resolved = shutil.which(value)
+    resolved = which_cached(value)
     if not resolved:
         raise OpenHandsError(
             f"OpenHands CLI not found on PATH: {value}. Install OpenHands or pass --openhands-bin."
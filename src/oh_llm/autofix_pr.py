@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-import re
+import os
 import subprocess
 from dataclasses import dataclass
 from pathlib import Path
@@ -21,7 +21,7 @@ _EPHEMERAL_PARTS = {
 
 
 def _is_ephemeral(path: str) -> bool:
-    norm = path.replace("\\", "/").lstrip("./")
+    norm = path.replace("\\", "/").removeprefix("./")
     if norm.endswith(".pyc"):
         return True
     parts = [p for p in norm.split("/") if p]
@@ -84,41 +84,25 @@ class ChangeSelection:
         }
 
 
-_STATUS_RENAME = re.compile(r"^..\s+(?P<old>.+?)\s+->\s+(?P<new>.+)$")
-
-
-def _unquote_porcelain_path(value: str) -> str:
-    # Porcelain v1 quotes weird filenames; good enough for our v1 use.
-    return value.strip().strip('"')
-
-
-def _parse_porcelain_line_paths(line: str) -> list[str]:
-    if not line:
-        return []
-
-    # `XY <path>` (possibly with rename `old -> new`)
-    if len(line) < 4:
-        return []
-
-    match = _STATUS_RENAME.match(line)
-    if match:
-        old = _unquote_porcelain_path(match.group("old"))
-        new = _unquote_porcelain_path(match.group("new"))
-        return [p for p in [old, new] if p]
-
-    path = _unquote_porcelain_path(line[3:])
-    return [path] if path else []
+def _porcelain_z_paths(output: str) -> list[str]:
+    # `git status --porcelain=v1 -z`: NUL-terminated `XY <path>` entries, never quoted; renames and
+    # copies are `XY <new>` followed by a separate `<orig>` entry.
+    paths: list[str] = []
+    entries = iter(output.split("\0"))
+    for entry in entries:
+        if len(entry) < 4:
+            continue
+        paths.append(entry[3:])
+        if "R" in entry[:2] or "C" in entry[:2]:
+            orig = next(entries, "")
+            if orig:
+                paths.append(orig)
+    return paths
 
 
 def select_paths_to_commit(repo: Path) -> ChangeSelection:
-    proc = _run_git(repo, ["status", "--porcelain=v1"])
-    raw_lines = [ln.rstrip("\n") for ln in (proc.stdout or "").splitlines()]
-
-    candidates: list[str] = []
-    for line in raw_lines:
-        candidates.extend(_parse_porcelain_line_paths(line))
-
-    unique = sorted(set(p.lstrip("./") for p in candidates if p))
+    proc = _run_git(repo, ["status", "--porcelain=v1", "-z"])
+    unique = sorted(set(_porcelain_z_paths(proc.stdout or "")))
     paths: list[str] = []
     skipped: list[str] = []
     for path in unique:
@@ -129,6 +113,7 @@ def select_paths_to_commit(repo: Path) -> ChangeSelection:
 
     return ChangeSelection(paths=tuple(paths), skipped_ephemeral=tuple(skipped))
 
+
 def stage_selection(repo: Path, selection: ChangeSelection) -> None:
     _run_git(repo, ["add", "-A"])
     if selection.skipped_ephemeral:
@@ -187,11 +172,20 @@ def push_branch(repo: Path, *, remote: str, branch: str) -> None:
     _run_git(repo, ["push", "-u", remote, branch])
 
 
+_GH_LOGIN_CACHE: dict[tuple[str | None, ...], str] = {}
+
+
 def gh_user_login(repo: Path) -> str:
+    """GitHub login of the authenticated `gh` user, memoized per `gh` environment."""
+    key = tuple(os.environ.get(name) for name in ("PATH", "GH_HOST", "GH_CONFIG_DIR"))
+    cached = _GH_LOGIN_CACHE.get(key)
+    if cached is not None:
+        return cached
     proc = _run_gh(repo, ["api", "user", "--jq", ".login"])
     login = (proc.stdout or "").strip()
     if not login:
         raise AgentSdkError("Unable to determine GitHub login via `gh`.")
+    _GH_LOGIN_CACHE[key] = login
     return login
 
 
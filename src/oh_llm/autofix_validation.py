@@ -7,8 +7,12 @@ from pathlib import Path
 from typing import Any
 
 from oh_llm.agent_sdk import uv_run_python
+from oh_llm.fileio import write_private_text
 from oh_llm.redaction import Redactor
 
+# `json.dumps` builds a fresh encoder whenever non-default options are passed; reuse one.
+_ARTIFACT_ENCODER = json.JSONEncoder(indent=2, ensure_ascii=False)
+
 
 @dataclass(frozen=True)
 class CommandResult:
@@ -75,11 +79,4 @@ def write_validation_artifact(
     redactor: Redactor,
 ) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(
-        json.dumps(redactor.redact_obj(payload), indent=2, ensure_ascii=False) + "\n",
-        encoding="utf-8",
-    )
-    try:
-        path.chmod(0o600)
-    except OSError:
-        pass
+    write_private_text(path, _ARTIFACT_ENCODER.encode(redactor.redact_obj(payload)) + "\n")
@@ -1,45 +1,36 @@
 from __future__ import annotations
 
+import io
 import json
 import os
 import subprocess
-import tarfile
+import threading
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from enum import IntEnum
-from gzip import GzipFile
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Annotated, Any, NoReturn, TextIO
 
 import typer
 
 from oh_llm import __version__
 from oh_llm.agent_sdk import (
     AgentSdkError,
+    AgentSdkInfo,
     collect_agent_sdk_info,
     is_git_repo,
     resolve_agent_sdk_path,
     uv_run_python,
 )
-from oh_llm.autofix_capsule import extract_redact_env, write_capsule_artifacts
-from oh_llm.autofix_openhands import OpenHandsError, resolve_openhands_bin, run_openhands_agent
-from oh_llm.autofix_pr import (
-    current_branch,
-    ensure_commit,
-    ensure_remote,
-    gh_pr_create,
-    gh_user_login,
-    git_show_stat,
-    push_branch,
-    render_pr_body,
-    select_paths_to_commit,
-)
-from oh_llm.autofix_validation import (
-    parse_json_stdout,
-    run_repro_stage,
-    write_validation_artifact,
+from oh_llm.autofix_capsule import (
+    CapsuleArtifacts,
+    ensure_capsule_artifacts,
+    extract_redact_env,
+    write_capsule_artifacts,
 )
 from oh_llm.failures import failure_from_stages, update_run_failure
+from oh_llm.fileio import write_private_text
 from oh_llm.profiles import (
     delete_profile,
     get_profile,
@@ -49,10 +40,13 @@ from oh_llm.profiles import (
 )
 from oh_llm.redaction import Redactor, redactor_from_env_vars
 from oh_llm.run_store import (
+    RunPaths,
+    agent_sdk_record,
     append_log,
     build_run_record,
     create_run_dir,
     default_stage_template,
+    open_log,
     resolve_runs_dir,
     write_run_json,
 )
@@ -62,16 +56,11 @@ from oh_llm.runs import (
     list_run_dirs,
     read_run_record,
     resolve_run_dir,
+    summarize_record,
     summarize_run,
 )
 from oh_llm.stage_a import StageAOutcome, run_stage_a
-from oh_llm.stage_b import StageBOutcome, run_stage_b
-from oh_llm.worktrees import (
-    cleanup_sdk_worktree,
-    create_sdk_worktree,
-    mark_worktree_cleaned,
-    write_worktree_record,
-)
+from oh_llm.stage_b import StageBOutcome, discard_stage_b_artifacts, run_stage_b
 
 
 class ExitCode(IntEnum):
@@ -92,24 +81,65 @@ runs_app = typer.Typer(no_args_is_help=True)
 autofix_app = typer.Typer(no_args_is_help=True)
 sdk_app = typer.Typer(no_args_is_help=True)
 
-_STAGE_B_TERMINAL_TYPES: set[str] = {"subprocess", "tmux"}
+JsonOption = Annotated[
+    bool,
+    typer.Option("--json", help="Emit machine-readable JSON output for this command."),
+]
+RunsDirOption = Annotated[
+    str | None,
+    typer.Option(
+        "--runs-dir",
+        help="Override runs directory (default: $OH_LLM_RUNS_DIR or ~/.oh-llm/runs).",
+    ),
+]
+
+# `json.dumps(..., sort_keys=True)` constructs a new encoder per call; `_emit` reuses this one.
+_JSON_ENCODER = json.JSONEncoder(sort_keys=True)
+
+_STAGE_B_TERMINAL_TYPES = frozenset({"subprocess", "tmux"})
+_STAGE_B_TERMINAL_TYPE_ERROR = (
+    "Invalid value for --stage-b-terminal-type. "
+    f"Expected one of: {', '.join(sorted(_STAGE_B_TERMINAL_TYPES))}."
+)
 _STAGE_B_MAX_ITERATIONS_MAX = 200
+_MOCK_ENV_OFF_VALUES = frozenset({"", "0", "false", "False"})
 
 
 def _ctx(ctx: typer.Context) -> CliContext:
     obj = ctx.obj
-    if isinstance(obj, CliContext):
+    if obj.__class__ is CliContext:
         return obj
-    return CliContext(json_output=False, redactor=Redactor())
+    return CliContext(json_output=False, redactor=redactor_from_env_vars())
+
+
+@lru_cache(maxsize=4)
+def _expand_runs_dir(runs_dir: str, home: str | None) -> Path:
+    return Path(runs_dir).expanduser()
+
+
+def _resolve_runs_dir_arg(runs_dir: str | None) -> Path:
+    # Both branches are memoized; keys include $HOME (and $OH_LLM_RUNS_DIR via run_store).
+    if not runs_dir:
+        return resolve_runs_dir()
+    return _expand_runs_dir(runs_dir, os.environ.get("HOME"))
+
+
+def _env_mock_enabled() -> bool:
+    return os.environ.get("OH_LLM_MOCK", "") not in _MOCK_ENV_OFF_VALUES
 
 
 def _emit(ctx: CliContext, *, payload: dict[str, Any], text: str) -> None:
     if ctx.json_output:
-        typer.echo(json.dumps(ctx.redactor.redact_obj(payload), sort_keys=True))
+        typer.echo(_JSON_ENCODER.encode(ctx.redactor.redact_obj(payload)))
         return
     typer.echo(text)
 
 
+def _fail(cli_ctx: CliContext, *, payload: dict[str, Any], text: str) -> NoReturn:
+    _emit(cli_ctx, payload=payload, text=text)
+    raise typer.Exit(code=ExitCode.RUN_FAILED)
+
+
 def _ctx_with_json_override(ctx: typer.Context, *, json_output: bool) -> CliContext:
     base = _ctx(ctx)
     if json_output:
@@ -118,6 +148,8 @@ def _ctx_with_json_override(ctx: typer.Context, *, json_output: bool) -> CliCont
 
 
 def _normalize_stage_b_terminal_type(value: str | None) -> str:
+    if value is not None and value in _STAGE_B_TERMINAL_TYPES:
+        return value
     raw = str(value or "").strip().lower()
     if not raw:
         return "subprocess"
@@ -127,10 +159,7 @@ def _normalize_stage_b_terminal_type(value: str | None) -> str:
 def _validate_stage_b_options(*, terminal_type: str | None, max_iterations: int) -> tuple[str, int]:
     normalized_terminal_type = _normalize_stage_b_terminal_type(terminal_type)
     if normalized_terminal_type not in _STAGE_B_TERMINAL_TYPES:
-        raise ValueError(
-            "Invalid value for --stage-b-terminal-type. "
-            f"Expected one of: {', '.join(sorted(_STAGE_B_TERMINAL_TYPES))}."
-        )
+        raise ValueError(_STAGE_B_TERMINAL_TYPE_ERROR)
 
     if max_iterations < 1 or max_iterations > _STAGE_B_MAX_ITERATIONS_MAX:
         raise ValueError(
@@ -141,6 +170,38 @@ def _validate_stage_b_options(*, terminal_type: str | None, max_iterations: int)
     return normalized_terminal_type, max_iterations
 
 
+def _fail_run_config(
+    cli_ctx: CliContext,
+    *,
+    record: dict[str, Any],
+    stage: str,
+    error: dict[str, Any],
+    run_paths: RunPaths,
+    log_handle: TextIO,
+    redactor: Redactor,
+    log_message: str,
+    text: str,
+) -> NoReturn:
+    """Record a pre-flight config failure for `stage`, report it, and exit."""
+    stage_record = record["stages"][stage]
+    stage_record["status"] = "fail"
+    stage_record["duration_ms"] = 0
+    stage_record["error"] = error
+    update_run_failure(record)
+    write_run_json(path=run_paths.run_json, run_record=record, redactor=redactor)
+    append_log(path=run_paths.log_file, handle=log_handle, message=log_message, redactor=redactor)
+    _fail(
+        cli_ctx,
+        payload={
+            "ok": False,
+            "run_dir": str(run_paths.run_dir),
+            "stages": record["stages"],
+            "failure": record.get("failure"),
+        },
+        text=text,
+    )
+
+
 @app.callback()
 def _main(
     ctx: typer.Context,
@@ -160,17 +221,56 @@ def _main(
         typer.echo(__version__)
         raise typer.Exit()
 
-    ctx.obj = CliContext(json_output=json_output, redactor=Redactor())
+    ctx.obj = CliContext(json_output=json_output, redactor=redactor_from_env_vars())
+
+
+class _OverlappedStageB:
+    """Stage B running on a worker thread while Stage A runs on the main one."""
+
+    def __init__(self, **stage_b_kwargs: Any) -> None:
+        self._cancel = threading.Event()
+        self._outcome: StageBOutcome | None = None
+        self._error: BaseException | None = None
+        self._thread = threading.Thread(
+            target=self._run, kwargs=stage_b_kwargs, name="oh-llm-stage-b"
+        )
+        self._thread.start()
+
+    def _run(self, **stage_b_kwargs: Any) -> None:
+        try:
+            self._outcome = run_stage_b(cancel=self._cancel, **stage_b_kwargs)
+        except BaseException as exc:
+            self._error = exc
+
+    def result(self) -> StageBOutcome:
+        self._thread.join()
+        outcome = self._outcome
+        if outcome is None:
+            raise self._error or RuntimeError("Stage B did not finish.")
+        return outcome
+
+    def stop(self) -> None:
+        """Cancel Stage B (killing its probe) and wait for the worker, which then exits promptly."""
+        self._cancel.set()
+        self._thread.join()
+
+    def discard(self, artifacts_dir: Path) -> None:
+        self.stop()
+        discard_stage_b_artifacts(artifacts_dir)
+
+
+def _start_overlapped_stage_b(ctx: typer.Context, **stage_b_kwargs: Any) -> _OverlappedStageB:
+    # Overlap the two provider round-trips. Stage B is cancelled rather than awaited when the
+    # command context closes, so an early exit never blocks on the provider.
+    overlapped = _OverlappedStageB(**stage_b_kwargs)
+    ctx.call_on_close(overlapped.stop)
+    return overlapped
 
 
 @app.command()
 def run(
     ctx: typer.Context,
-    json_output: bool = typer.Option(
-        False,
-        "--json",
-        help="Emit machine-readable JSON output for this command.",
-    ),
+    json_output: JsonOption = False,
     profile: str | None = typer.Option(
         None,
         "--profile",
@@ -182,11 +282,7 @@ def run(
         "--sdk-path",
         help="Path to agent-sdk checkout (default: $OH_LLM_AGENT_SDK_PATH or ~/repos/agent-sdk).",
     ),
-    runs_dir: str | None = typer.Option(
-        None,
-        "--runs-dir",
-        help="Override runs directory (default: $OH_LLM_RUNS_DIR or ~/.oh-llm/runs).",
-    ),
+    runs_dir: RunsDirOption = None,
     redact_env: list[str] = typer.Option(
         [],
         "--redact-env",
@@ -217,15 +313,19 @@ def run(
         "--mock-stage-b-mode",
         help="Mock Stage B mode (native or compat).",
     ),
+    parallel_stages: bool = typer.Option(
+        False,
+        "--parallel-stages",
+        help="Start Stage B alongside Stage A (results are still only recorded if A passes).",
+    ),
 ) -> None:
     """Run the compatibility suite for a configured LLM."""
     cli_ctx = _ctx_with_json_override(ctx, json_output=json_output)
 
-    resolved_runs_dir = Path(runs_dir).expanduser() if runs_dir else resolve_runs_dir()
-    mock_enabled = bool(mock) or bool(os.environ.get("OH_LLM_MOCK"))
+    resolved_runs_dir = _resolve_runs_dir_arg(runs_dir)
+    mock_enabled = bool(mock) or _env_mock_enabled()
 
     resolved_sdk_path = resolve_agent_sdk_path(Path(agent_sdk_path) if agent_sdk_path else None)
-    sdk_info = collect_agent_sdk_info(resolved_sdk_path)
 
     run_paths = create_run_dir(runs_dir=resolved_runs_dir, profile_name=profile)
     stages = default_stage_template()
@@ -242,140 +342,111 @@ def run(
         created_at=run_paths.created_at,
         profile={
             "name": profile or "unknown",
-            "redact_env": sorted(set([*redact_env, *auto_redact])),
+            "redact_env": sorted({*redact_env, *auto_redact}),
             "resolved": profile_record.as_json() if profile_record else None,
         },
-        agent_sdk=sdk_info,
+        # git sha/dirty (subprocesses) are filled in once the config checks below pass.
+        agent_sdk=AgentSdkInfo(
+            path=resolved_sdk_path, git_sha=None, git_dirty=None, uv_available=False
+        ),
         stages=stages,
+        requested={
+            "stage_b": bool(stage_b),
+            "mock": bool(mock_enabled),
+            "mock_stage_b_mode": str(mock_stage_b_mode),
+            "stage_b_terminal_type": stage_b_terminal_type,
+            "stage_b_max_iterations": int(stage_b_max_iterations),
+        },
     )
-    record["requested"] = {
-        "stage_b": bool(stage_b),
-        "mock": bool(mock_enabled),
-        "mock_stage_b_mode": str(mock_stage_b_mode),
-        "stage_b_terminal_type": stage_b_terminal_type,
-        "stage_b_max_iterations": int(stage_b_max_iterations),
-    }
-    write_run_json(path=run_paths.run_json, run_record=record, redactor=redactor)
+    # One buffered handle for the whole run; the click context closes (and flushes) it on exit,
+    # including the early `typer.Exit` paths.
+    log_handle = open_log(run_paths.log_file)
+    ctx.call_on_close(log_handle.close)
     append_log(
         path=run_paths.log_file,
+        handle=log_handle,
         message="run initialized",
         redactor=redactor,
     )
 
     if not profile:
-        stages["A"]["status"] = "fail"
-        stages["A"]["duration_ms"] = 0
-        stages["A"]["error"] = {
-            "classification": "credential_or_config",
-            "type": "ConfigError",
-            "message": "Missing required option: --profile",
-            "hint": (
-                "Create a profile first via `oh-llm profile add ...` "
-                "and re-run with `--profile <id>`."
-            ),
-        }
-        update_run_failure(record)
-        write_run_json(path=run_paths.run_json, run_record=record, redactor=redactor)
-        append_log(
-            path=run_paths.log_file,
-            message="Stage A: FAIL (missing --profile)",
-            redactor=redactor,
-        )
-        _emit(
+        _fail_run_config(
             cli_ctx,
-            payload={
-                "ok": False,
-                "run_dir": str(run_paths.run_dir),
-                "stages": stages,
-                "failure": record.get("failure"),
+            record=record,
+            stage="A",
+            error={
+                "classification": "credential_or_config",
+                "type": "ConfigError",
+                "message": "Missing required option: --profile",
+                "hint": (
+                    "Create a profile first via `oh-llm profile add ...` "
+                    "and re-run with `--profile <id>`."
+                ),
             },
+            run_paths=run_paths,
+            log_handle=log_handle,
+            redactor=redactor,
+            log_message="Stage A: FAIL (missing --profile)",
             text="Missing --profile (see run.json for details).",
         )
-        raise typer.Exit(code=ExitCode.RUN_FAILED)
 
     if profile_record is None:
-        stages["A"]["status"] = "fail"
-        stages["A"]["duration_ms"] = 0
-        stages["A"]["error"] = {
-            "classification": "credential_or_config",
-            "type": "ConfigError",
-            "message": f"Profile not found: {profile}",
-            "hint": "Create it via `oh-llm profile add ...` or check `oh-llm profile list`.",
-        }
-        update_run_failure(record)
-        write_run_json(path=run_paths.run_json, run_record=record, redactor=redactor)
-        append_log(
-            path=run_paths.log_file,
-            message="Stage A: FAIL (profile not found)",
-            redactor=redactor,
-        )
-        _emit(
+        _fail_run_config(
             cli_ctx,
-            payload={
-                "ok": False,
-                "run_dir": str(run_paths.run_dir),
-                "stages": stages,
-                "failure": record.get("failure"),
+            record=record,
+            stage="A",
+            error={
+                "classification": "credential_or_config",
+                "type": "ConfigError",
+                "message": f"Profile not found: {profile}",
+                "hint": "Create it via `oh-llm profile add ...` or check `oh-llm profile list`.",
             },
+            run_paths=run_paths,
+            log_handle=log_handle,
+            redactor=redactor,
+            log_message="Stage A: FAIL (profile not found)",
             text=f"Profile not found: {profile}",
         )
-        raise typer.Exit(code=ExitCode.RUN_FAILED)
 
-    if not profile_record.model or not profile_record.api_key_env:
-        stages["A"]["status"] = "fail"
-        stages["A"]["duration_ms"] = 0
-        stages["A"]["error"] = {
-            "classification": "credential_or_config",
-            "type": "ConfigError",
-            "message": "Profile is missing required fields (model and/or api_key_env).",
-            "hint": "Recreate the profile via `oh-llm profile add ... --overwrite`.",
-        }
-        update_run_failure(record)
-        write_run_json(path=run_paths.run_json, run_record=record, redactor=redactor)
-        append_log(
-            path=run_paths.log_file,
-            message="Stage A: FAIL (profile incomplete)",
-            redactor=redactor,
-        )
-        _emit(
+    # Bind the profile fields once; the checks and stage calls below reuse them.
+    model = profile_record.model
+    base_url = profile_record.base_url
+    api_key_env = profile_record.api_key_env
+    if not model or not api_key_env:
+        _fail_run_config(
             cli_ctx,
-            payload={
-                "ok": False,
-                "run_dir": str(run_paths.run_dir),
-                "stages": stages,
-                "failure": record.get("failure"),
+            record=record,
+            stage="A",
+            error={
+                "classification": "credential_or_config",
+                "type": "ConfigError",
+                "message": "Profile is missing required fields (model and/or api_key_env).",
+                "hint": "Recreate the profile via `oh-llm profile add ... --overwrite`.",
             },
+            run_paths=run_paths,
+            log_handle=log_handle,
+            redactor=redactor,
+            log_message="Stage A: FAIL (profile incomplete)",
             text="Profile is incomplete (missing model/api_key_env).",
         )
-        raise typer.Exit(code=ExitCode.RUN_FAILED)
 
-    if not mock_enabled and not os.environ.get(profile_record.api_key_env):
-        stages["A"]["status"] = "fail"
-        stages["A"]["duration_ms"] = 0
-        stages["A"]["error"] = {
-            "classification": "credential_or_config",
-            "type": "ConfigError",
-            "message": f"API key env var not set: {profile_record.api_key_env}",
-            "hint": f"Export `{profile_record.api_key_env}` and re-run.",
-        }
-        update_run_failure(record)
-        write_run_json(path=run_paths.run_json, run_record=record, redactor=redactor)
-        append_log(
-            path=run_paths.log_file,
-            message="Stage A: FAIL (missing api key env)",
-            redactor=redactor,
-        )
-        _emit(
+    if not mock_enabled and not os.environ.get(api_key_env):
+        _fail_run_config(
             cli_ctx,
-            payload={
-                "ok": False,
-                "run_dir": str(run_paths.run_dir),
-                "stages": stages,
-                "failure": record.get("failure"),
+            record=record,
+            stage="A",
+            error={
+                "classification": "credential_or_config",
+                "type": "ConfigError",
+                "message": f"API key env var not set: {api_key_env}",
+                "hint": f"Export `{api_key_env}` and re-run.",
             },
+            run_paths=run_paths,
+            log_handle=log_handle,
+            redactor=redactor,
+            log_message="Stage A: FAIL (missing api key env)",
             text="API key env var not set (see run.json for details).",
         )
-        raise typer.Exit(code=ExitCode.RUN_FAILED)
 
     if stage_b:
         try:
@@ -384,35 +455,50 @@ def run(
                 max_iterations=stage_b_max_iterations,
             )
         except ValueError as exc:
-            stages["B"]["status"] = "fail"
-            stages["B"]["duration_ms"] = 0
-            stages["B"]["error"] = {
-                "classification": "credential_or_config",
-                "type": "ConfigError",
-                "message": str(exc),
-                "hint": (
-                    "Use `--stage-b-terminal-type subprocess` or `--stage-b-terminal-type tmux`, "
-                    "and set `--stage-b-max-iterations` to a small positive integer."
-                ),
-            }
-            update_run_failure(record)
-            write_run_json(path=run_paths.run_json, run_record=record, redactor=redactor)
-            append_log(
-                path=run_paths.log_file,
-                message="Stage B: FAIL (invalid options)",
-                redactor=redactor,
-            )
-            _emit(
+            _fail_run_config(
                 cli_ctx,
-                payload={
-                    "ok": False,
-                    "run_dir": str(run_paths.run_dir),
-                    "stages": stages,
-                    "failure": record.get("failure"),
+                record=record,
+                stage="B",
+                error={
+                    "classification": "credential_or_config",
+                    "type": "ConfigError",
+                    "message": str(exc),
+                    "hint": (
+                        "Use `--stage-b-terminal-type subprocess` or "
+                        "`--stage-b-terminal-type tmux`, "
+                        "and set `--stage-b-max-iterations` to a small positive integer."
+                    ),
                 },
+                run_paths=run_paths,
+                log_handle=log_handle,
+                redactor=redactor,
+                log_message="Stage B: FAIL (invalid options)",
                 text=str(exc),
             )
-            raise typer.Exit(code=ExitCode.RUN_FAILED)
+
+    record["agent_sdk"] = agent_sdk_record(collect_agent_sdk_info(resolved_sdk_path))
+
+    # Config checks above write run.json once on failure; persist the in-progress record here so
+    # a run interrupted during Stage A still shows up in `runs list`. Mock stages complete
+    # immediately, so mock runs only write run.json once, after the last stage.
+    if not mock_enabled:
+        write_run_json(path=run_paths.run_json, run_record=record, redactor=redactor)
+        log_handle.flush()
+
+    overlapped_b = None
+    if parallel_stages and stage_b and not mock_enabled:
+        overlapped_b = _start_overlapped_stage_b(
+            ctx,
+            agent_sdk_path=resolved_sdk_path,
+            artifacts_dir=run_paths.artifacts_dir,
+            model=model,
+            base_url=base_url,
+            api_key_env=api_key_env,
+            timeout_s=60,
+            max_iterations=stage_b_max_iterations,
+            terminal_type=stage_b_terminal_type,
+            redactor=redactor,
+        )
 
     # Stage A: connectivity + basic completion
     if mock_enabled:
@@ -427,33 +513,48 @@ def run(
         outcome = run_stage_a(
             agent_sdk_path=resolved_sdk_path,
             artifacts_dir=run_paths.artifacts_dir,
-            model=profile_record.model,
-            base_url=profile_record.base_url,
-            api_key_env=profile_record.api_key_env,
+            model=model,
+            base_url=base_url,
+            api_key_env=api_key_env,
             timeout_s=30,
             redactor=redactor,
         )
-    stages["A"]["duration_ms"] = outcome.duration_ms
+    stage_a_record = stages["A"]
+    stage_a_record["duration_ms"] = outcome.duration_ms
     if outcome.ok:
-        stages["A"]["status"] = "pass"
-        stages["A"]["result"] = {"response_preview": outcome.response_preview}
-        append_log(path=run_paths.log_file, message="Stage A: PASS", redactor=redactor)
+        stage_a_record["status"] = "pass"
+        stage_a_record["result"] = {"response_preview": outcome.response_preview}
+        append_log(
+            path=run_paths.log_file,
+            handle=log_handle,
+            message="Stage A: PASS",
+            redactor=redactor,
+        )
     else:
-        stages["A"]["status"] = "fail"
-        stages["A"]["error"] = outcome.error or {
+        stage_a_record["status"] = "fail"
+        stage_a_record["error"] = outcome.error or {
             "classification": "sdk_or_provider_bug",
             "type": "UnknownError",
             "message": "Stage A failed.",
             "hint": "Inspect run artifacts for details.",
         }
+        update_run_failure(record)
         append_log(
             path=run_paths.log_file,
-            message=f"Stage A: FAIL ({stages['A']['error'].get('classification','unknown')})",
+            handle=log_handle,
+            message=f"Stage A: FAIL ({stage_a_record['error'].get('classification','unknown')})",
             redactor=redactor,
         )
 
-    update_run_failure(record)
-    write_run_json(path=run_paths.run_json, run_record=record, redactor=redactor)
+    # Stages only move from not_run to pass/fail, so the failure summary can only change on a
+    # fail transition; it is refreshed there rather than after every stage.
+    if not (mock_enabled and stage_b):
+        write_run_json(path=run_paths.run_json, run_record=record, redactor=redactor)
+
+    if overlapped_b is not None and not outcome.ok:
+        # A sequential run never starts Stage B after a Stage A failure; make this one look the
+        # same so the capsule agrees with run.json that B did not run.
+        overlapped_b.discard(run_paths.artifacts_dir)
 
     if not outcome.ok or not stage_b:
         payload = {
@@ -473,6 +574,8 @@ def run(
                     typer.echo(f"Failure classification: {failure.get('classification','unknown')}")
         raise typer.Exit(code=ExitCode.OK if outcome.ok else ExitCode.RUN_FAILED)
 
+    log_handle.flush()
+
     # Stage B: end-to-end agent run (tool calling)
     if mock_enabled:
         mode = str(mock_stage_b_mode or "native").strip().lower()
@@ -489,13 +592,10 @@ def run(
             "mock": True,
             "mock_mode": mode,
         }
-        # Match real Stage B behavior by writing the probe result artifact.
+        # Match real Stage B behavior by writing the probe result artifact. The mock payload is
+        # built from constants only, so it is serialized directly instead of via redact_json.
         probe_result_path = run_paths.artifacts_dir / "stage_b_probe_result.json"
-        probe_result_path.write_text(redactor.redact_json(raw), encoding="utf-8")
-        try:
-            probe_result_path.chmod(0o600)
-        except OSError:
-            pass
+        write_private_text(probe_result_path, json.dumps(raw, sort_keys=True, indent=2) + "\n")
 
         outcome_b = StageBOutcome(
             ok=True,
@@ -508,47 +608,56 @@ def run(
             error=None,
             raw=raw,
         )
+    elif overlapped_b is not None:
+        outcome_b = overlapped_b.result()
     else:
         outcome_b = run_stage_b(
             agent_sdk_path=resolved_sdk_path,
             artifacts_dir=run_paths.artifacts_dir,
-            model=profile_record.model,
-            base_url=profile_record.base_url,
-            api_key_env=profile_record.api_key_env,
+            model=model,
+            base_url=base_url,
+            api_key_env=api_key_env,
             timeout_s=60,
             max_iterations=stage_b_max_iterations,
             terminal_type=stage_b_terminal_type,
             redactor=redactor,
         )
-    stages["B"]["duration_ms"] = outcome_b.duration_ms
+    stage_b_record = stages["B"]
+    stage_b_record["duration_ms"] = outcome_b.duration_ms
     if outcome_b.ok:
-        stages["B"]["status"] = "pass"
-        stages["B"]["result"] = {
+        stage_b_record["status"] = "pass"
+        stage_b_record["result"] = {
             "tool_invoked": outcome_b.tool_invoked,
             "tool_observed": outcome_b.tool_observed,
             "tool_command_preview": outcome_b.tool_command_preview,
             "tool_output_preview": outcome_b.tool_output_preview,
             "final_answer_preview": outcome_b.final_answer_preview,
         }
-        append_log(path=run_paths.log_file, message="Stage B: PASS", redactor=redactor)
+        append_log(
+            path=run_paths.log_file,
+            handle=log_handle,
+            message="Stage B: PASS",
+            redactor=redactor,
+        )
     else:
-        stages["B"]["status"] = "fail"
-        stages["B"]["error"] = outcome_b.error or {
+        stage_b_record["status"] = "fail"
+        stage_b_record["error"] = outcome_b.error or {
             "classification": "sdk_or_provider_bug",
             "type": "UnknownError",
             "message": "Stage B failed.",
             "hint": "Inspect run artifacts for details.",
         }
+        update_run_failure(record)
         append_log(
             path=run_paths.log_file,
-            message=f"Stage B: FAIL ({stages['B']['error'].get('classification','unknown')})",
+            handle=log_handle,
+            message=f"Stage B: FAIL ({stage_b_record['error'].get('classification','unknown')})",
             redactor=redactor,
         )
 
-    update_run_failure(record)
     write_run_json(path=run_paths.run_json, run_record=record, redactor=redactor)
 
-    ok = stages["A"]["status"] == "pass" and stages["B"]["status"] == "pass"
+    ok = stage_a_record["status"] == "pass" and stage_b_record["status"] == "pass"
     payload = {
         "ok": ok,
         "run_dir": str(run_paths.run_dir),
@@ -571,11 +680,7 @@ def run(
 @profile_app.command("list")
 def profile_list(
     ctx: typer.Context,
-    json_output: bool = typer.Option(
-        False,
-        "--json",
-        help="Emit machine-readable JSON output for this command.",
-    ),
+    json_output: JsonOption = False,
 ) -> None:
     """List known LLM profiles."""
     cli_ctx = _ctx_with_json_override(ctx, json_output=json_output)
@@ -611,11 +716,7 @@ def profile_add(
         "--overwrite",
         help="Overwrite existing profile + metadata if present.",
     ),
-    json_output: bool = typer.Option(
-        False,
-        "--json",
-        help="Emit machine-readable JSON output for this command.",
-    ),
+    json_output: JsonOption = False,
 ) -> None:
     """Create an LLM profile without persisting secrets."""
     cli_ctx = _ctx_with_json_override(ctx, json_output=json_output)
@@ -628,8 +729,7 @@ def profile_add(
             overwrite=overwrite,
         )
     except (ValueError, FileExistsError) as exc:
-        _emit(cli_ctx, payload={"ok": False, "error": str(exc)}, text=str(exc))
-        raise typer.Exit(code=ExitCode.RUN_FAILED)
+        _fail(cli_ctx, payload={"ok": False, "error": str(exc)}, text=str(exc))
 
     _emit(
         cli_ctx,
@@ -654,11 +754,7 @@ def profile_create_compat(
         "--overwrite",
         help="Overwrite existing profile + metadata if present.",
     ),
-    json_output: bool = typer.Option(
-        False,
-        "--json",
-        help="Emit machine-readable JSON output for this command.",
-    ),
+    json_output: JsonOption = False,
 ) -> None:
     """Alias for `profile add` (kept for early compatibility)."""
     profile_add(
@@ -676,27 +772,21 @@ def profile_create_compat(
 def profile_show(
     ctx: typer.Context,
     profile_id: str = typer.Argument(..., help="Profile ID to show."),
-    json_output: bool = typer.Option(
-        False,
-        "--json",
-        help="Emit machine-readable JSON output for this command.",
-    ),
+    json_output: JsonOption = False,
 ) -> None:
     """Show a single LLM profile."""
     cli_ctx = _ctx_with_json_override(ctx, json_output=json_output)
     try:
         record = get_profile(profile_id)
     except ValueError as exc:
-        _emit(cli_ctx, payload={"ok": False, "error": str(exc)}, text=str(exc))
-        raise typer.Exit(code=ExitCode.RUN_FAILED)
+        _fail(cli_ctx, payload={"ok": False, "error": str(exc)}, text=str(exc))
 
     if record is None:
-        _emit(
+        _fail(
             cli_ctx,
             payload={"ok": False, "error": "not_found", "profile_id": profile_id},
             text=f"Profile not found: {profile_id}",
         )
-        raise typer.Exit(code=ExitCode.RUN_FAILED)
 
     _emit(cli_ctx, payload={"ok": True, "profile": record.as_json()}, text=record.profile_id)
 
@@ -725,16 +815,12 @@ def profile_edit(
         "--api-key-env",
         help="Set env var name holding the API key (value is never stored).",
     ),
-    json_output: bool = typer.Option(
-        False,
-        "--json",
-        help="Emit machine-readable JSON output for this command.",
-    ),
+    json_output: JsonOption = False,
 ) -> None:
     """Edit an existing LLM profile (non-secret fields only)."""
     cli_ctx = _ctx_with_json_override(ctx, json_output=json_output)
     if model is None and base_url is None and not clear_base_url and api_key_env is None:
-        _emit(
+        _fail(
             cli_ctx,
             payload={
                 "ok": False,
@@ -746,9 +832,8 @@ def profile_edit(
             },
             text="No changes requested.",
         )
-        raise typer.Exit(code=ExitCode.RUN_FAILED)
     if base_url is not None and clear_base_url:
-        _emit(
+        _fail(
             cli_ctx,
             payload={
                 "ok": False,
@@ -757,7 +842,6 @@ def profile_edit(
             },
             text="Conflicting options: --base-url and --clear-base-url",
         )
-        raise typer.Exit(code=ExitCode.RUN_FAILED)
 
     try:
         record = update_profile(
@@ -768,8 +852,7 @@ def profile_edit(
             api_key_env=api_key_env,
         )
     except (ValueError, FileNotFoundError) as exc:
-        _emit(cli_ctx, payload={"ok": False, "error": str(exc)}, text=str(exc))
-        raise typer.Exit(code=ExitCode.RUN_FAILED)
+        _fail(cli_ctx, payload={"ok": False, "error": str(exc)}, text=str(exc))
 
     _emit(
         cli_ctx,
@@ -787,19 +870,14 @@ def profile_delete(
         "--missing-ok",
         help="Succeed even if the profile does not exist.",
     ),
-    json_output: bool = typer.Option(
-        False,
-        "--json",
-        help="Emit machine-readable JSON output for this command.",
-    ),
+    json_output: JsonOption = False,
 ) -> None:
     """Delete an LLM profile (SDK profile + oh-llm metadata)."""
     cli_ctx = _ctx_with_json_override(ctx, json_output=json_output)
     try:
         result = delete_profile(profile_id=profile_id, missing_ok=missing_ok)
     except (ValueError, FileNotFoundError) as exc:
-        _emit(cli_ctx, payload={"ok": False, "error": str(exc)}, text=str(exc))
-        raise typer.Exit(code=ExitCode.RUN_FAILED)
+        _fail(cli_ctx, payload={"ok": False, "error": str(exc)}, text=str(exc))
 
     deleted = bool(result.get("deleted"))
     if deleted:
@@ -812,16 +890,8 @@ def profile_delete(
 @runs_app.command("list")
 def runs_list(
     ctx: typer.Context,
-    json_output: bool = typer.Option(
-        False,
-        "--json",
-        help="Emit machine-readable JSON output for this command.",
-    ),
-    runs_dir: str | None = typer.Option(
-        None,
-        "--runs-dir",
-        help="Override runs directory (default: $OH_LLM_RUNS_DIR or ~/.oh-llm/runs).",
-    ),
+    json_output: JsonOption = False,
+    runs_dir: RunsDirOption = None,
     limit: int = typer.Option(
         20,
         "--limit",
@@ -830,10 +900,10 @@ def runs_list(
 ) -> None:
     """List previous runs."""
     cli_ctx = _ctx_with_json_override(ctx, json_output=json_output)
-    resolved_runs_dir = Path(runs_dir).expanduser() if runs_dir else resolve_runs_dir()
+    resolved_runs_dir = _resolve_runs_dir_arg(runs_dir)
     summaries = [
         summarize_run(run_dir)
-        for run_dir in list_run_dirs(resolved_runs_dir)[: max(limit, 0)]
+        for run_dir in list_run_dirs(resolved_runs_dir, limit=max(limit, 0))
     ]
 
     if cli_ctx.json_output:
@@ -857,49 +927,38 @@ def runs_list(
 def runs_show(
     ctx: typer.Context,
     run: str = typer.Argument(..., help="Run id or run directory name/prefix."),
-    json_output: bool = typer.Option(
-        False,
-        "--json",
-        help="Emit machine-readable JSON output for this command.",
-    ),
-    runs_dir: str | None = typer.Option(
-        None,
-        "--runs-dir",
-        help="Override runs directory (default: $OH_LLM_RUNS_DIR or ~/.oh-llm/runs).",
-    ),
+    json_output: JsonOption = False,
+    runs_dir: RunsDirOption = None,
 ) -> None:
     """Show details for one run."""
     cli_ctx = _ctx_with_json_override(ctx, json_output=json_output)
-    resolved_runs_dir = Path(runs_dir).expanduser() if runs_dir else resolve_runs_dir()
+    resolved_runs_dir = _resolve_runs_dir_arg(runs_dir)
 
     try:
         run_dir = resolve_run_dir(resolved_runs_dir, run)
     except (RunNotFoundError, RunAmbiguousError) as exc:
-        _emit(cli_ctx, payload={"ok": False, "error": str(exc)}, text=str(exc))
-        raise typer.Exit(code=ExitCode.RUN_FAILED)
+        _fail(cli_ctx, payload={"ok": False, "error": str(exc)}, text=str(exc))
 
     record_path = run_dir / "run.json"
     if not record_path.exists():
-        _emit(
+        _fail(
             cli_ctx,
             payload={"ok": False, "error": "run.json missing", "run_dir": str(run_dir)},
             text=f"run.json missing in: {run_dir}",
         )
-        raise typer.Exit(code=ExitCode.RUN_FAILED)
 
     payload = read_run_record(run_dir)
     if payload is None:
-        _emit(
+        _fail(
             cli_ctx,
             payload={"ok": False, "error": "run.json corrupt", "run_dir": str(run_dir)},
             text=f"run.json corrupt in: {run_dir}",
         )
-        raise typer.Exit(code=ExitCode.RUN_FAILED)
     if cli_ctx.json_output:
         _emit(cli_ctx, payload={"ok": True, "run_dir": str(run_dir), "run": payload}, text="")
         return
 
-    summary = summarize_run(run_dir)
+    summary = summarize_record(run_dir, payload)
     typer.echo(f"run_dir: {run_dir}")
     typer.echo(f"run_id: {summary.run_id or '(unknown)'}")
     typer.echo(f"created_at: {summary.created_at or '(unknown)'}")
@@ -908,12 +967,24 @@ def runs_show(
         typer.echo(f"stage {key}: {summary.stage_statuses[key]}")
 
 
+_EXPORT_COPY_BUFSIZE = 1024 * 1024
+
+
 def _export_run_dir_tar_gz(*, run_dir: Path, output_path: Path) -> None:
+    # Imported here: only `runs export` needs them, and they are not free at CLI startup.
+    import tarfile
+    from gzip import GzipFile
+
     output_path.parent.mkdir(parents=True, exist_ok=True)
     with output_path.open("wb") as raw:
-        with GzipFile(fileobj=raw, mode="wb", mtime=0) as gz:
-            with tarfile.open(fileobj=gz, mode="w") as tar:
-                tar.add(run_dir, arcname=run_dir.name)
+        # Level 6 (zlib's default) instead of GzipFile's 9: much faster on logs, similar size.
+        with GzipFile(fileobj=raw, mode="wb", mtime=0, compresslevel=6) as gz:
+            # Coalesce tarfile's many 512-byte header/padding writes before they reach gzip.
+            with io.BufferedWriter(gz, buffer_size=_EXPORT_COPY_BUFSIZE) as buffered:
+                with tarfile.open(
+                    fileobj=buffered, mode="w", copybufsize=_EXPORT_COPY_BUFSIZE
+                ) as tar:
+                    tar.add(run_dir, arcname=run_dir.name)
     try:
         output_path.chmod(0o600)
     except OSError:
@@ -924,16 +995,8 @@ def _export_run_dir_tar_gz(*, run_dir: Path, output_path: Path) -> None:
 def runs_export(
     ctx: typer.Context,
     run: str = typer.Argument(..., help="Run id or run directory name/prefix to export."),
-    json_output: bool = typer.Option(
-        False,
-        "--json",
-        help="Emit machine-readable JSON output for this command.",
-    ),
-    runs_dir: str | None = typer.Option(
-        None,
-        "--runs-dir",
-        help="Override runs directory (default: $OH_LLM_RUNS_DIR or ~/.oh-llm/runs).",
-    ),
+    json_output: JsonOption = False,
+    runs_dir: RunsDirOption = None,
     output: str | None = typer.Option(
         None,
         "--output",
@@ -942,21 +1005,21 @@ def runs_export(
 ) -> None:
     """Export a run directory to a tar.gz archive for sharing."""
     cli_ctx = _ctx_with_json_override(ctx, json_output=json_output)
-    resolved_runs_dir = Path(runs_dir).expanduser() if runs_dir else resolve_runs_dir()
+    resolved_runs_dir = _resolve_runs_dir_arg(runs_dir)
 
     try:
         run_dir = resolve_run_dir(resolved_runs_dir, run)
     except (RunNotFoundError, RunAmbiguousError) as exc:
-        _emit(cli_ctx, payload={"ok": False, "error": str(exc)}, text=str(exc))
-        raise typer.Exit(code=ExitCode.RUN_FAILED)
+        _fail(cli_ctx, payload={"ok": False, "error": str(exc)}, text=str(exc))
 
     if not (run_dir / "run.json").exists():
-        _emit(
+        _fail(
             cli_ctx,
             payload={"ok": False, "error": "run.json missing", "run_dir": str(run_dir)},
             text=f"run.json missing in: {run_dir}",
         )
-        raise typer.Exit(code=ExitCode.RUN_FAILED)
+
+    import tarfile
 
     output_path = (
         Path(output).expanduser() if output else (run_dir.parent / f"{run_dir.name}.tar.gz")
@@ -964,7 +1027,7 @@ def runs_export(
     try:
         _export_run_dir_tar_gz(run_dir=run_dir, output_path=output_path)
     except (OSError, tarfile.TarError) as exc:
-        _emit(
+        _fail(
             cli_ctx,
             payload={
                 "ok": False,
@@ -974,7 +1037,6 @@ def runs_export(
             },
             text=str(exc),
         )
-        raise typer.Exit(code=ExitCode.RUN_FAILED)
 
     _emit(
         cli_ctx,
@@ -983,9 +1045,32 @@ def runs_export(
     )
 
 
+def _resolve_run_and_record(
+    cli_ctx: CliContext, *, run: str, runs_dir: str | None
+) -> tuple[Path, dict[str, Any]]:
+    """Resolve `--run` to its run dir and run.json record, or report the error and exit."""
+    try:
+        run_dir = resolve_run_dir(_resolve_runs_dir_arg(runs_dir), run)
+    except (RunNotFoundError, RunAmbiguousError) as exc:
+        _fail(cli_ctx, payload={"ok": False, "error": str(exc)}, text=str(exc))
+
+    record = read_run_record(run_dir)
+    if record is None:
+        _fail(
+            cli_ctx,
+            payload={"ok": False, "error": "run.json missing or corrupt", "run_dir": str(run_dir)},
+            text=f"run.json missing or corrupt in: {run_dir}",
+        )
+    return run_dir, record
+
+
 def _autofix_profile_name_for_branch(*, record: dict[str, Any]) -> str:
-    profile = record.get("profile") if isinstance(record.get("profile"), dict) else {}
-    resolved = profile.get("resolved") if isinstance(profile.get("resolved"), dict) else {}
+    profile = record.get("profile")
+    if not isinstance(profile, dict):
+        profile = {}
+    resolved = profile.get("resolved")
+    if not isinstance(resolved, dict):
+        resolved = {}
     return (
         str(profile.get("name") or "").strip()
         or str(profile.get("model") or "").strip()
@@ -994,25 +1079,71 @@ def _autofix_profile_name_for_branch(*, record: dict[str, Any]) -> str:
     )
 
 
+def _record_identity(record: dict[str, Any], run_dir: Path) -> tuple[str, str]:
+    """Return `(run_id, profile_name)` for a run record, falling back to the dir name."""
+    run_id = str(record.get("run_id") or run_dir.name).strip()
+    profile = record.get("profile")
+    name = profile.get("name") if isinstance(profile, dict) else None
+    return run_id, str(name or "unknown").strip()
+
+
 def _autofix_failure(record: dict[str, Any]) -> dict[str, Any]:
     failure = record.get("failure")
     if isinstance(failure, dict):
         return failure
-    stages = record.get("stages") if isinstance(record.get("stages"), dict) else {}
+    stages = record.get("stages")
+    if not isinstance(stages, dict):
+        stages = {}
     inferred = failure_from_stages(stages)
     return inferred if isinstance(inferred, dict) else {}
 
 
+# Failure classes an auto-fix cannot address; refused unless `--force` is given.
+_REFUSE_CLASSIFICATIONS = frozenset({"credential_or_config"})
+
+
 def _autofix_should_refuse(*, classification: str, force: bool) -> bool:
-    return classification == "credential_or_config" and not force
+    return not force and classification in _REFUSE_CLASSIFICATIONS
+
+
+def _autofix_refuse_config_failure(
+    cli_ctx: CliContext, *, record: dict[str, Any], run_dir: Path, force: bool
+) -> None:
+    """Exit with `refused` for credential/config failures unless `--force` was given."""
+    failure = _autofix_failure(record)
+    classification = failure.get("classification")
+    if not isinstance(classification, str):
+        classification = "unknown"
+    if _autofix_should_refuse(classification=classification, force=force):
+        _fail(
+            cli_ctx,
+            payload={
+                "ok": False,
+                "error": "refused",
+                "reason": classification,
+                "run_dir": str(run_dir),
+                "failure": failure,
+            },
+            text=(
+                "Refusing to auto-fix a credential/config failure by default. "
+                "Fix credentials/config and re-run, or pass --force."
+            ),
+        )
+
+
+def _redaction_names(record: dict[str, Any], redact_env: list[str]) -> list[str]:
+    # `extract_redact_env` is already sorted and unique; only the CLI extras need de-duping.
+    return list(dict.fromkeys([*extract_redact_env(record), *redact_env]))
 
 
 def _autofix_load_worktree_record(path: Path) -> dict[str, Any] | None:
-    if not path.exists():
+    try:
+        raw = path.read_bytes()
+    except FileNotFoundError:
         return None
     try:
-        payload = json.loads(path.read_text(encoding="utf-8"))
-    except json.JSONDecodeError:
+        payload = json.loads(raw)
+    except (json.JSONDecodeError, UnicodeDecodeError):
         return None
     return payload if isinstance(payload, dict) else None
 
@@ -1023,7 +1154,7 @@ class AutofixWorktreeMissingError(Exception):
         self.worktree_path = worktree_path
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AutofixWorktree:
     worktree_path: Path
     worktree_record_path: Path
@@ -1037,12 +1168,18 @@ def _autofix_ensure_sdk_worktree(
     resolved_sdk_path: Path,
     allow_dirty_sdk: bool,
 ) -> AutofixWorktree:
+    # Autofix-only modules are imported where used so `run`, `runs` and `--help` skip them.
+    from oh_llm.worktrees import create_sdk_worktree, write_worktree_record
+
     worktree_path = artifacts_dir / "autofix_sdk_worktree"
     worktree_record_path = artifacts_dir / "autofix_worktree.json"
-    worktree_record = _autofix_load_worktree_record(worktree_record_path)
 
-    if not worktree_path.exists():
-        run_id = str(record.get("run_id") or artifacts_dir.parent.name).strip()
+    # One stat on the common "already created" path; the record is only read in that branch
+    # since a fresh worktree replaces it.
+    if worktree_path.exists():
+        worktree_record = _autofix_load_worktree_record(worktree_record_path)
+    else:
+        run_id, _ = _record_identity(record, artifacts_dir.parent)
         created = create_sdk_worktree(
             agent_sdk_path=resolved_sdk_path,
             worktree_path=worktree_path,
@@ -1053,9 +1190,8 @@ def _autofix_ensure_sdk_worktree(
         )
         write_worktree_record(worktree_record_path, record=created)
         worktree_record = created.as_json()
-
-    if not worktree_path.exists():
-        raise AutofixWorktreeMissingError(worktree_path)
+        if not worktree_path.exists():
+            raise AutofixWorktreeMissingError(worktree_path)
 
     return AutofixWorktree(
         worktree_path=worktree_path,
@@ -1083,39 +1219,22 @@ def _autofix_pipeline(
     draft: bool,
     dry_run: bool,
 ) -> None:
-    failure = _autofix_failure(record)
-    classification_value = failure.get("classification")
-    classification = classification_value if isinstance(classification_value, str) else "unknown"
-
-    if _autofix_should_refuse(classification=classification, force=force):
-        _emit(
-            cli_ctx,
-            payload={
-                "ok": False,
-                "error": "refused",
-                "reason": "credential_or_config",
-                "run_dir": str(run_dir),
-                "failure": failure,
-            },
-            text=(
-                "Refusing to auto-fix a credential/config failure by default. "
-                "Fix credentials/config and re-run, or pass --force."
-            ),
-        )
-        raise typer.Exit(code=ExitCode.RUN_FAILED)
+    from oh_llm.autofix_openhands import (
+        OpenHandsError,
+        resolve_openhands_bin,
+        run_openhands_agent,
+    )
 
-    redaction_names = sorted(set([*extract_redact_env(record), *redact_env]))
-    redactor = redactor_from_env_vars(*redaction_names)
+    _autofix_refuse_config_failure(cli_ctx, record=record, run_dir=run_dir, force=force)
 
     try:
         resolved_openhands = resolve_openhands_bin(openhands_bin)
     except OpenHandsError as exc:
-        _emit(
+        _fail(
             cli_ctx,
             payload={"ok": False, "error": str(exc), "run_dir": str(run_dir)},
             text=str(exc),
         )
-        raise typer.Exit(code=ExitCode.RUN_FAILED)
 
     resolved_sdk_path = resolve_agent_sdk_path(Path(agent_sdk_path) if agent_sdk_path else None)
     artifacts_dir = run_dir / "artifacts"
@@ -1127,14 +1246,13 @@ def _autofix_pipeline(
             allow_dirty_sdk=allow_dirty_sdk,
         )
     except AgentSdkError as exc:
-        _emit(
+        _fail(
             cli_ctx,
             payload={"ok": False, "error": str(exc), "run_dir": str(run_dir)},
             text=str(exc),
         )
-        raise typer.Exit(code=ExitCode.RUN_FAILED)
     except AutofixWorktreeMissingError as exc:
-        _emit(
+        _fail(
             cli_ctx,
             payload={
                 "ok": False,
@@ -1143,15 +1261,19 @@ def _autofix_pipeline(
             },
             text=str(exc),
         )
-        raise typer.Exit(code=ExitCode.RUN_FAILED)
 
     worktree_path = ensured.worktree_path
     worktree_record = ensured.worktree_record
 
-    capsule_artifacts = write_capsule_artifacts(
+    # Built only once the cheap refusals and the worktree step have passed.
+    redaction_names = _redaction_names(record, redact_env)
+    redactor = redactor_from_env_vars(*redaction_names)
+
+    capsule_artifacts = ensure_capsule_artifacts(
         run_dir=run_dir,
         run_record=record,
         redactor=redactor,
+        redaction_names=redaction_names,
     )
 
     try:
@@ -1166,12 +1288,11 @@ def _autofix_pipeline(
             redactor=redactor,
         )
     except (OpenHandsError, AgentSdkError, OSError, subprocess.SubprocessError) as exc:
-        _emit(
+        _fail(
             cli_ctx,
             payload={"ok": False, "error": str(exc), "run_dir": str(run_dir)},
             text=str(exc),
         )
-        raise typer.Exit(code=ExitCode.RUN_FAILED)
 
     validation_payload = _autofix_validate_impl(
         run_dir=run_dir,
@@ -1179,9 +1300,20 @@ def _autofix_pipeline(
         redactor=redactor,
         resolved_sdk_path=resolved_sdk_path,
         allow_dirty_sdk=allow_dirty_sdk,
+        capsule_artifacts=capsule_artifacts,
+        worktree=ensured,
     )
+    pipeline_artifacts = {
+        "capsule_json": str(capsule_artifacts.capsule_json),
+        "capsule_md": str(capsule_artifacts.capsule_md),
+        "repro_script": str(capsule_artifacts.repro_script),
+        "openhands_context_md": str(openhands_artifacts.context_md),
+        "openhands_transcript_log": str(openhands_artifacts.transcript_log),
+        "openhands_diff_patch": str(openhands_artifacts.diff_patch),
+        "openhands_run_record_json": str(openhands_artifacts.run_record_json),
+    }
     if validation_payload["ok"] is not True:
-        _emit(
+        _fail(
             cli_ctx,
             payload={
                 "ok": False,
@@ -1189,19 +1321,10 @@ def _autofix_pipeline(
                 "run_dir": str(run_dir),
                 "worktree_path": str(worktree_path),
                 "validation": validation_payload,
-                "artifacts": {
-                    "capsule_json": str(capsule_artifacts.capsule_json),
-                    "capsule_md": str(capsule_artifacts.capsule_md),
-                    "repro_script": str(capsule_artifacts.repro_script),
-                    "openhands_context_md": str(openhands_artifacts.context_md),
-                    "openhands_transcript_log": str(openhands_artifacts.transcript_log),
-                    "openhands_diff_patch": str(openhands_artifacts.diff_patch),
-                    "openhands_run_record_json": str(openhands_artifacts.run_record_json),
-                },
+                "artifacts": pipeline_artifacts,
             },
             text="Validation did not pass; refusing to open an upstream PR.",
         )
-        raise typer.Exit(code=ExitCode.RUN_FAILED)
 
     pr_payload = _autofix_pr_impl(
         cli_ctx=cli_ctx,
@@ -1228,13 +1351,7 @@ def _autofix_pipeline(
             "worktree_path": str(worktree_path),
             "pr": pr_payload,
             "artifacts": {
-                "capsule_json": str(capsule_artifacts.capsule_json),
-                "capsule_md": str(capsule_artifacts.capsule_md),
-                "repro_script": str(capsule_artifacts.repro_script),
-                "openhands_context_md": str(openhands_artifacts.context_md),
-                "openhands_transcript_log": str(openhands_artifacts.transcript_log),
-                "openhands_diff_patch": str(openhands_artifacts.diff_patch),
-                "openhands_run_record_json": str(openhands_artifacts.run_record_json),
+                **pipeline_artifacts,
                 "validation_json": str(artifacts_dir / "autofix_validation.json"),
                 "validation_md": str(artifacts_dir / "autofix_validation.md"),
             },
@@ -1256,16 +1373,8 @@ def autofix(
         "--run",
         help="Run id or run directory name/prefix to auto-fix.",
     ),
-    json_output: bool = typer.Option(
-        False,
-        "--json",
-        help="Emit machine-readable JSON output for this command.",
-    ),
-    runs_dir: str | None = typer.Option(
-        None,
-        "--runs-dir",
-        help="Override runs directory (default: $OH_LLM_RUNS_DIR or ~/.oh-llm/runs).",
-    ),
+    json_output: JsonOption = False,
+    runs_dir: RunsDirOption = None,
     agent_sdk_path: str | None = typer.Option(
         None,
         "--agent-sdk-path",
@@ -1343,21 +1452,7 @@ def autofix(
         typer.echo(ctx.get_help())
         raise typer.Exit(code=ExitCode.RUN_FAILED)
 
-    resolved_runs_dir = Path(runs_dir).expanduser() if runs_dir else resolve_runs_dir()
-    try:
-        run_dir = resolve_run_dir(resolved_runs_dir, run)
-    except (RunNotFoundError, RunAmbiguousError) as exc:
-        _emit(cli_ctx, payload={"ok": False, "error": str(exc)}, text=str(exc))
-        raise typer.Exit(code=ExitCode.RUN_FAILED)
-
-    record = read_run_record(run_dir)
-    if record is None:
-        _emit(
-            cli_ctx,
-            payload={"ok": False, "error": "run.json missing or corrupt", "run_dir": str(run_dir)},
-            text=f"run.json missing or corrupt in: {run_dir}",
-        )
-        raise typer.Exit(code=ExitCode.RUN_FAILED)
+    run_dir, record = _resolve_run_and_record(cli_ctx, run=run, runs_dir=runs_dir)
 
     _autofix_pipeline(
         cli_ctx=cli_ctx,
@@ -1382,21 +1477,13 @@ def autofix(
 @autofix_app.command("start")
 def autofix_start(
     ctx: typer.Context,
-    json_output: bool = typer.Option(
-        False,
-        "--json",
-        help="Emit machine-readable JSON output for this command.",
-    ),
+    json_output: JsonOption = False,
     run: str | None = typer.Option(
         None,
         "--run",
         help="Run id or run directory name/prefix to auto-fix.",
     ),
-    runs_dir: str | None = typer.Option(
-        None,
-        "--runs-dir",
-        help="Override runs directory (default: $OH_LLM_RUNS_DIR or ~/.oh-llm/runs).",
-    ),
+    runs_dir: RunsDirOption = None,
     agent_sdk_path: str | None = typer.Option(
         None,
         "--agent-sdk-path",
@@ -1473,21 +1560,7 @@ def autofix_start(
         typer.echo(ctx.get_help())
         raise typer.Exit(code=ExitCode.RUN_FAILED)
 
-    resolved_runs_dir = Path(runs_dir).expanduser() if runs_dir else resolve_runs_dir()
-    try:
-        run_dir = resolve_run_dir(resolved_runs_dir, run)
-    except (RunNotFoundError, RunAmbiguousError) as exc:
-        _emit(cli_ctx, payload={"ok": False, "error": str(exc)}, text=str(exc))
-        raise typer.Exit(code=ExitCode.RUN_FAILED)
-
-    record = read_run_record(run_dir)
-    if record is None:
-        _emit(
-            cli_ctx,
-            payload={"ok": False, "error": "run.json missing or corrupt", "run_dir": str(run_dir)},
-            text=f"run.json missing or corrupt in: {run_dir}",
-        )
-        raise typer.Exit(code=ExitCode.RUN_FAILED)
+    run_dir, record = _resolve_run_and_record(cli_ctx, run=run, runs_dir=runs_dir)
 
     _autofix_pipeline(
         cli_ctx=cli_ctx,
@@ -1512,21 +1585,13 @@ def autofix_start(
 @autofix_app.command("worktree")
 def autofix_worktree(
     ctx: typer.Context,
-    json_output: bool = typer.Option(
-        False,
-        "--json",
-        help="Emit machine-readable JSON output for this command.",
-    ),
+    json_output: JsonOption = False,
     run: str = typer.Option(
         ...,
         "--run",
         help="Run id or run directory name/prefix to prepare a worktree for.",
     ),
-    runs_dir: str | None = typer.Option(
-        None,
-        "--runs-dir",
-        help="Override runs directory (default: $OH_LLM_RUNS_DIR or ~/.oh-llm/runs).",
-    ),
+    runs_dir: RunsDirOption = None,
     keep_worktree: bool = typer.Option(
         False,
         "--keep-worktree",
@@ -1540,31 +1605,21 @@ def autofix_worktree(
     agent_sdk_path: str | None = typer.Option(
         None,
         "--agent-sdk-path",
-        help="Path to agent-sdk checkout (default: $OH_LLM_AGENT_SDK_PATH or ~/repos/agent-sdk).",
-    ),
-) -> None:
-    """Create an agent-sdk git worktree for an auto-fix run."""
-    cli_ctx = _ctx_with_json_override(ctx, json_output=json_output)
-    resolved_runs_dir = Path(runs_dir).expanduser() if runs_dir else resolve_runs_dir()
-
-    try:
-        run_dir = resolve_run_dir(resolved_runs_dir, run)
-    except (RunNotFoundError, RunAmbiguousError) as exc:
-        _emit(cli_ctx, payload={"ok": False, "error": str(exc)}, text=str(exc))
-        raise typer.Exit(code=ExitCode.RUN_FAILED)
+        help="Path to agent-sdk checkout (default: $OH_LLM_AGENT_SDK_PATH or ~/repos/agent-sdk).",
+    ),
+) -> None:
+    """Create an agent-sdk git worktree for an auto-fix run."""
+    from oh_llm.worktrees import (
+        cleanup_sdk_worktree,
+        create_sdk_worktree,
+        mark_worktree_cleaned,
+        write_worktree_record,
+    )
 
-    record = read_run_record(run_dir)
-    if record is None:
-        _emit(
-            cli_ctx,
-            payload={"ok": False, "error": "run.json missing or corrupt", "run_dir": str(run_dir)},
-            text=f"run.json missing or corrupt in: {run_dir}",
-        )
-        raise typer.Exit(code=ExitCode.RUN_FAILED)
+    cli_ctx = _ctx_with_json_override(ctx, json_output=json_output)
+    run_dir, record = _resolve_run_and_record(cli_ctx, run=run, runs_dir=runs_dir)
 
-    run_id = str(record.get("run_id") or run_dir.name).strip()
-    profile_obj = record.get("profile") if isinstance(record.get("profile"), dict) else {}
-    profile_name = str(profile_obj.get("name") or "unknown").strip()
+    run_id, profile_name = _record_identity(record, run_dir)
 
     resolved_sdk_path = resolve_agent_sdk_path(Path(agent_sdk_path) if agent_sdk_path else None)
     worktree_path = run_dir / "artifacts" / "autofix_sdk_worktree"
@@ -1606,31 +1661,22 @@ def autofix_worktree(
         )
         raise typer.Exit(code=ExitCode.OK)
     except (AgentSdkError, ValueError) as exc:
-        _emit(
+        _fail(
             cli_ctx,
             payload={"ok": False, "error": str(exc), "run_dir": str(run_dir)},
             text=str(exc),
         )
-        raise typer.Exit(code=ExitCode.RUN_FAILED)
 
 @autofix_app.command("capsule")
 def autofix_capsule(
     ctx: typer.Context,
-    json_output: bool = typer.Option(
-        False,
-        "--json",
-        help="Emit machine-readable JSON output for this command.",
-    ),
+    json_output: JsonOption = False,
     run: str = typer.Option(
         ...,
         "--run",
         help="Run id or run directory name/prefix to generate artifacts for.",
     ),
-    runs_dir: str | None = typer.Option(
-        None,
-        "--runs-dir",
-        help="Override runs directory (default: $OH_LLM_RUNS_DIR or ~/.oh-llm/runs).",
-    ),
+    runs_dir: RunsDirOption = None,
     redact_env: list[str] = typer.Option(
         [],
         "--redact-env",
@@ -1639,24 +1685,9 @@ def autofix_capsule(
 ) -> None:
     """Generate a repro harness + error capsule for an existing run."""
     cli_ctx = _ctx_with_json_override(ctx, json_output=json_output)
-    resolved_runs_dir = Path(runs_dir).expanduser() if runs_dir else resolve_runs_dir()
-
-    try:
-        run_dir = resolve_run_dir(resolved_runs_dir, run)
-    except (RunNotFoundError, RunAmbiguousError) as exc:
-        _emit(cli_ctx, payload={"ok": False, "error": str(exc)}, text=str(exc))
-        raise typer.Exit(code=ExitCode.RUN_FAILED)
-
-    record = read_run_record(run_dir)
-    if record is None:
-        _emit(
-            cli_ctx,
-            payload={"ok": False, "error": "run.json missing or corrupt", "run_dir": str(run_dir)},
-            text=f"run.json missing or corrupt in: {run_dir}",
-        )
-        raise typer.Exit(code=ExitCode.RUN_FAILED)
+    run_dir, record = _resolve_run_and_record(cli_ctx, run=run, runs_dir=runs_dir)
 
-    redaction_names = sorted(set([*extract_redact_env(record), *redact_env]))
+    redaction_names = _redaction_names(record, redact_env)
     redactor = redactor_from_env_vars(*redaction_names)
     artifacts = write_capsule_artifacts(run_dir=run_dir, run_record=record, redactor=redactor)
 
@@ -1678,21 +1709,13 @@ def autofix_capsule(
 @autofix_app.command("agent")
 def autofix_agent(
     ctx: typer.Context,
-    json_output: bool = typer.Option(
-        False,
-        "--json",
-        help="Emit machine-readable JSON output for this command.",
-    ),
+    json_output: JsonOption = False,
     run: str = typer.Option(
         ...,
         "--run",
         help="Run id or run directory name/prefix to auto-fix.",
     ),
-    runs_dir: str | None = typer.Option(
-        None,
-        "--runs-dir",
-        help="Override runs directory (default: $OH_LLM_RUNS_DIR or ~/.oh-llm/runs).",
-    ),
+    runs_dir: RunsDirOption = None,
     agent_sdk_path: str | None = typer.Option(
         None,
         "--agent-sdk-path",
@@ -1720,55 +1743,21 @@ def autofix_agent(
     ),
 ) -> None:
     """Run an OpenHands agent in an agent-sdk worktree and capture redacted artifacts."""
-    cli_ctx = _ctx_with_json_override(ctx, json_output=json_output)
-    resolved_runs_dir = Path(runs_dir).expanduser() if runs_dir else resolve_runs_dir()
-
-    try:
-        run_dir = resolve_run_dir(resolved_runs_dir, run)
-    except (RunNotFoundError, RunAmbiguousError) as exc:
-        _emit(cli_ctx, payload={"ok": False, "error": str(exc)}, text=str(exc))
-        raise typer.Exit(code=ExitCode.RUN_FAILED)
-
-    record = read_run_record(run_dir)
-    if record is None:
-        _emit(
-            cli_ctx,
-            payload={"ok": False, "error": "run.json missing or corrupt", "run_dir": str(run_dir)},
-            text=f"run.json missing or corrupt in: {run_dir}",
-        )
-        raise typer.Exit(code=ExitCode.RUN_FAILED)
-
-    failure = record.get("failure")
-    if not isinstance(failure, dict):
-        stages = record.get("stages") if isinstance(record.get("stages"), dict) else {}
-        failure = failure_from_stages(stages)
+    from oh_llm.autofix_openhands import (
+        OpenHandsError,
+        resolve_openhands_bin,
+        run_openhands_agent,
+    )
 
-    classification = failure.get("classification") if isinstance(failure, dict) else "unknown"
-    if classification == "credential_or_config" and not force:
-        _emit(
-            cli_ctx,
-            payload={
-                "ok": False,
-                "error": "refused",
-                "reason": "credential_or_config",
-                "run_dir": str(run_dir),
-                "failure": failure,
-            },
-            text=(
-                "Refusing to auto-fix a credential/config failure by default. "
-                "Fix credentials/config and re-run, or pass --force."
-            ),
-        )
-        raise typer.Exit(code=ExitCode.RUN_FAILED)
+    cli_ctx = _ctx_with_json_override(ctx, json_output=json_output)
+    run_dir, record = _resolve_run_and_record(cli_ctx, run=run, runs_dir=runs_dir)
 
-    redaction_names = sorted(set([*extract_redact_env(record), *redact_env]))
-    redactor = redactor_from_env_vars(*redaction_names)
+    _autofix_refuse_config_failure(cli_ctx, record=record, run_dir=run_dir, force=force)
 
     try:
         resolved_openhands = resolve_openhands_bin(openhands_bin)
     except OpenHandsError as exc:
-        _emit(cli_ctx, payload={"ok": False, "error": str(exc)}, text=str(exc))
-        raise typer.Exit(code=ExitCode.RUN_FAILED)
+        _fail(cli_ctx, payload={"ok": False, "error": str(exc)}, text=str(exc))
 
     resolved_sdk_path = resolve_agent_sdk_path(Path(agent_sdk_path) if agent_sdk_path else None)
     artifacts_dir = run_dir / "artifacts"
@@ -1780,14 +1769,13 @@ def autofix_agent(
             allow_dirty_sdk=allow_dirty_sdk,
         )
     except AgentSdkError as exc:
-        _emit(
+        _fail(
             cli_ctx,
             payload={"ok": False, "error": str(exc), "run_dir": str(run_dir)},
             text=str(exc),
         )
-        raise typer.Exit(code=ExitCode.RUN_FAILED)
     except AutofixWorktreeMissingError as exc:
-        _emit(
+        _fail(
             cli_ctx,
             payload={
                 "ok": False,
@@ -1796,16 +1784,20 @@ def autofix_agent(
             },
             text=str(exc),
         )
-        raise typer.Exit(code=ExitCode.RUN_FAILED)
 
     worktree_path = ensured.worktree_path
     worktree_record = ensured.worktree_record
 
+    # Built only once the cheap refusals and the worktree step have passed.
+    redaction_names = _redaction_names(record, redact_env)
+    redactor = redactor_from_env_vars(*redaction_names)
+
     # Ensure capsule artifacts exist; use them as context for the OpenHands agent.
-    capsule_artifacts = write_capsule_artifacts(
+    capsule_artifacts = ensure_capsule_artifacts(
         run_dir=run_dir,
         run_record=record,
         redactor=redactor,
+        redaction_names=redaction_names,
     )
 
     try:
@@ -1820,12 +1812,11 @@ def autofix_agent(
             redactor=redactor,
         )
     except (OpenHandsError, AgentSdkError, OSError, subprocess.SubprocessError) as exc:
-        _emit(
+        _fail(
             cli_ctx,
             payload={"ok": False, "error": str(exc), "run_dir": str(run_dir)},
             text=str(exc),
         )
-        raise typer.Exit(code=ExitCode.RUN_FAILED)
 
     _emit(
         cli_ctx,
@@ -1845,6 +1836,10 @@ def autofix_agent(
     raise typer.Exit(code=ExitCode.OK)
 
 
+def _utc_now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
 def _autofix_validate_impl(
     *,
     run_dir: Path,
@@ -1852,66 +1847,102 @@ def _autofix_validate_impl(
     redactor: Redactor,
     resolved_sdk_path: Path,
     allow_dirty_sdk: bool,
+    parallel_stages: bool = False,
+    capsule_artifacts: CapsuleArtifacts | None = None,
+    worktree: AutofixWorktree | None = None,
 ) -> dict[str, Any]:
+    from oh_llm.autofix_validation import (
+        parse_json_stdout,
+        run_repro_stage,
+        write_validation_artifact,
+    )
+
     artifacts_dir = run_dir / "artifacts"
 
-    worktree_path = artifacts_dir / "autofix_sdk_worktree"
-    try:
-        ensured = _autofix_ensure_sdk_worktree(
-            artifacts_dir=artifacts_dir,
-            record=record,
-            resolved_sdk_path=resolved_sdk_path,
-            allow_dirty_sdk=allow_dirty_sdk,
-        )
-    except AgentSdkError as exc:
-        return {
-            "ok": False,
-            "error": str(exc),
-            "run_dir": str(run_dir),
-            "worktree_path": str(worktree_path),
-        }
-    except AutofixWorktreeMissingError as exc:
-        return {
-            "ok": False,
-            "error": "worktree_missing",
-            "run_dir": str(run_dir),
-            "worktree_path": str(exc.worktree_path),
-        }
+    # The pipeline passes the worktree it already ensured in this process.
+    if worktree is None:
+        worktree_path = artifacts_dir / "autofix_sdk_worktree"
+        try:
+            worktree = _autofix_ensure_sdk_worktree(
+                artifacts_dir=artifacts_dir,
+                record=record,
+                resolved_sdk_path=resolved_sdk_path,
+                allow_dirty_sdk=allow_dirty_sdk,
+            )
+        except AgentSdkError as exc:
+            return {
+                "ok": False,
+                "error": str(exc),
+                "run_dir": str(run_dir),
+                "worktree_path": str(worktree_path),
+            }
+        except AutofixWorktreeMissingError as exc:
+            return {
+                "ok": False,
+                "error": "worktree_missing",
+                "run_dir": str(run_dir),
+                "worktree_path": str(exc.worktree_path),
+            }
 
-    worktree_path = ensured.worktree_path
+    worktree_path = worktree.worktree_path
 
-    repro_script_path = artifacts_dir / "autofix_repro.py"
+    # The pipeline passes the capsule it already ensured; the script is only re-rendered if it
+    # has gone missing since.
+    if capsule_artifacts is not None:
+        repro_script_path = capsule_artifacts.repro_script
+    else:
+        repro_script_path = artifacts_dir / "autofix_repro.py"
     if not repro_script_path.exists():
         repro_script_path = write_capsule_artifacts(
             run_dir=run_dir,
             run_record=record,
             redactor=redactor,
         ).repro_script
+        # Only a freshly written script needs re-checking; an existing one was just stat'ed.
+        if not repro_script_path.exists():
+            return {
+                "ok": False,
+                "error": "missing_repro_script",
+                "run_dir": str(run_dir),
+                "worktree_path": str(worktree_path),
+                "repro_script": str(repro_script_path),
+            }
 
-    if not repro_script_path.exists():
-        return {
-            "ok": False,
-            "error": "missing_repro_script",
-            "run_dir": str(run_dir),
-            "worktree_path": str(worktree_path),
-            "repro_script": str(repro_script_path),
-        }
+    created_at = _utc_now_iso()
 
-    created_at = datetime.now(timezone.utc).replace(microsecond=0).isoformat()
+    if parallel_stages:
+        # Both stages are subprocess-bound; artifacts are still written sequentially below.
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            future_a = pool.submit(
+                run_repro_stage,
+                worktree_path=worktree_path,
+                repro_script_path=repro_script_path,
+                stage="a",
+            )
+            future_b = pool.submit(
+                run_repro_stage,
+                worktree_path=worktree_path,
+                repro_script_path=repro_script_path,
+                stage="b",
+            )
+            result_a = future_a.result()
+            result_b = future_b.result()
+    else:
+        result_a = run_repro_stage(
+            worktree_path=worktree_path,
+            repro_script_path=repro_script_path,
+            stage="a",
+        )
+        result_b = run_repro_stage(
+            worktree_path=worktree_path,
+            repro_script_path=repro_script_path,
+            stage="b",
+        )
 
-    result_a = run_repro_stage(
-        worktree_path=worktree_path,
-        repro_script_path=repro_script_path,
-        stage="a",
-    )
     payload_a = parse_json_stdout(result_a) or {}
     stage_a_ok = payload_a.get("ok") is True and result_a.exit_code == 0
-
-    result_b = run_repro_stage(
-        worktree_path=worktree_path,
-        repro_script_path=repro_script_path,
-        stage="b",
-    )
     payload_b = parse_json_stdout(result_b) or {}
     stage_b_ok = payload_b.get("ok") is True and result_b.exit_code == 0
 
@@ -1947,49 +1978,46 @@ def _autofix_validate_impl(
 
     summary_path = artifacts_dir / "autofix_validation.json"
     summary_md_path = artifacts_dir / "autofix_validation.md"
+    # Stringify the shared paths once; they appear in the summary JSON, markdown and result.
+    run_dir_s = str(run_dir)
+    worktree_s = str(worktree_path)
+    repro_s = str(repro_script_path)
+    stage_artifacts = {"stage_a": str(stage_a_artifact), "stage_b": str(stage_b_artifact)}
     write_validation_artifact(
         path=summary_path,
         payload={
             "schema_version": 1,
             "created_at": created_at,
-            "run_dir": str(run_dir),
-            "worktree_path": str(worktree_path),
-            "repro_script": str(repro_script_path),
+            "run_dir": run_dir_s,
+            "worktree_path": worktree_s,
+            "repro_script": repro_s,
             "ok": overall_ok,
             "stages": {"a": {"ok": stage_a_ok}, "b": {"ok": stage_b_ok}},
-            "artifacts": {
-                "stage_a": str(stage_a_artifact),
-                "stage_b": str(stage_b_artifact),
-            },
+            "artifacts": stage_artifacts,
         },
         redactor=redactor,
     )
 
-    summary_md_path.write_text(
+    write_private_text(
+        summary_md_path,
         redactor.redact_text(
             "# oh-llm autofix validation\n\n"
             f"- ok: `{overall_ok}`\n"
-            f"- run_dir: `{run_dir}`\n"
-            f"- worktree_path: `{worktree_path}`\n"
-            f"- repro_script: `{repro_script_path}`\n"
+            f"- run_dir: `{run_dir_s}`\n"
+            f"- worktree_path: `{worktree_s}`\n"
+            f"- repro_script: `{repro_s}`\n"
         ),
-        encoding="utf-8",
     )
-    try:
-        summary_md_path.chmod(0o600)
-    except OSError:
-        pass
 
     return {
         "ok": overall_ok,
-        "run_dir": str(run_dir),
-        "worktree_path": str(worktree_path),
-        "repro_script": str(repro_script_path),
+        "run_dir": run_dir_s,
+        "worktree_path": worktree_s,
+        "repro_script": repro_s,
         "artifacts": {
             "validation_json": str(summary_path),
             "validation_md": str(summary_md_path),
-            "stage_a": str(stage_a_artifact),
-            "stage_b": str(stage_b_artifact),
+            **stage_artifacts,
         },
     }
 
@@ -1997,21 +2025,13 @@ def _autofix_validate_impl(
 @autofix_app.command("validate")
 def autofix_validate(
     ctx: typer.Context,
-    json_output: bool = typer.Option(
-        False,
-        "--json",
-        help="Emit machine-readable JSON output for this command.",
-    ),
+    json_output: JsonOption = False,
     run: str = typer.Option(
         ...,
         "--run",
         help="Run id or run directory name/prefix to validate.",
     ),
-    runs_dir: str | None = typer.Option(
-        None,
-        "--runs-dir",
-        help="Override runs directory (default: $OH_LLM_RUNS_DIR or ~/.oh-llm/runs).",
-    ),
+    runs_dir: RunsDirOption = None,
     agent_sdk_path: str | None = typer.Option(
         None,
         "--agent-sdk-path",
@@ -2027,27 +2047,17 @@ def autofix_validate(
         "--redact-env",
         help="Environment variable name to redact from validation artifacts (repeatable).",
     ),
+    parallel_stages: bool = typer.Option(
+        False,
+        "--parallel-stages",
+        help="Run the Stage A and Stage B repro commands concurrently.",
+    ),
 ) -> None:
     """Validate a fix in the agent-sdk worktree by running the repro harness."""
     cli_ctx = _ctx_with_json_override(ctx, json_output=json_output)
-    resolved_runs_dir = Path(runs_dir).expanduser() if runs_dir else resolve_runs_dir()
-
-    try:
-        run_dir = resolve_run_dir(resolved_runs_dir, run)
-    except (RunNotFoundError, RunAmbiguousError) as exc:
-        _emit(cli_ctx, payload={"ok": False, "error": str(exc)}, text=str(exc))
-        raise typer.Exit(code=ExitCode.RUN_FAILED)
-
-    record = read_run_record(run_dir)
-    if record is None:
-        _emit(
-            cli_ctx,
-            payload={"ok": False, "error": "run.json missing or corrupt", "run_dir": str(run_dir)},
-            text=f"run.json missing or corrupt in: {run_dir}",
-        )
-        raise typer.Exit(code=ExitCode.RUN_FAILED)
+    run_dir, record = _resolve_run_and_record(cli_ctx, run=run, runs_dir=runs_dir)
 
-    redaction_names = sorted(set([*extract_redact_env(record), *redact_env]))
+    redaction_names = _redaction_names(record, redact_env)
     redactor = redactor_from_env_vars(*redaction_names)
 
     resolved_sdk_path = resolve_agent_sdk_path(Path(agent_sdk_path) if agent_sdk_path else None)
@@ -2057,6 +2067,7 @@ def autofix_validate(
         redactor=redactor,
         resolved_sdk_path=resolved_sdk_path,
         allow_dirty_sdk=allow_dirty_sdk,
+        parallel_stages=parallel_stages,
     )
 
     _emit(
@@ -2084,28 +2095,42 @@ def _autofix_pr_impl(
     draft: bool,
     dry_run: bool,
 ) -> dict[str, Any]:
+    from oh_llm.autofix_pr import (
+        current_branch,
+        ensure_commit,
+        ensure_remote,
+        gh_pr_create,
+        gh_user_login,
+        git_show_stat,
+        push_branch,
+        render_pr_body,
+        select_paths_to_commit,
+    )
+    from oh_llm.autofix_validation import write_validation_artifact
+
     artifacts_dir = run_dir / "artifacts"
     pr_record_path = artifacts_dir / "autofix_upstream_pr.json"
     dry_run_record_path = artifacts_dir / "autofix_upstream_pr_dry_run.json"
     worktree_path = artifacts_dir / "autofix_sdk_worktree"
-    if pr_record_path.exists():
-        try:
-            existing = json.loads(pr_record_path.read_text(encoding="utf-8"))
-        except json.JSONDecodeError:
-            existing = None
-        if isinstance(existing, dict):
-            pr_obj = existing.get("pr") if isinstance(existing.get("pr"), dict) else {}
-            pr_url = pr_obj.get("url")
-            if isinstance(pr_url, str) and pr_url.strip():
-                return {
-                    "url": pr_url.strip(),
-                    "existing": True,
-                    "worktree_path": str(worktree_path),
-                    "artifacts": {
-                        "pr_record_json": str(pr_record_path),
-                        "pr_body_md": str(artifacts_dir / "autofix_upstream_pr_body.md"),
-                    },
-                }
+    try:
+        existing = json.loads(pr_record_path.read_bytes())
+    except (FileNotFoundError, json.JSONDecodeError, UnicodeDecodeError):
+        existing = None
+    if isinstance(existing, dict):
+        pr_obj = existing.get("pr")
+        if not isinstance(pr_obj, dict):
+            pr_obj = {}
+        pr_url = pr_obj.get("url")
+        if isinstance(pr_url, str) and pr_url.strip():
+            return {
+                "url": pr_url.strip(),
+                "existing": True,
+                "worktree_path": str(worktree_path),
+                "artifacts": {
+                    "pr_record_json": str(pr_record_path),
+                    "pr_body_md": str(artifacts_dir / "autofix_upstream_pr_body.md"),
+                },
+            }
 
     try:
         _autofix_ensure_sdk_worktree(
@@ -2115,14 +2140,13 @@ def _autofix_pr_impl(
             allow_dirty_sdk=allow_dirty_sdk,
         )
     except AgentSdkError as exc:
-        _emit(
+        _fail(
             cli_ctx,
             payload={"ok": False, "error": str(exc), "run_dir": str(run_dir)},
             text=str(exc),
         )
-        raise typer.Exit(code=ExitCode.RUN_FAILED)
     except AutofixWorktreeMissingError as exc:
-        _emit(
+        _fail(
             cli_ctx,
             payload={
                 "ok": False,
@@ -2131,11 +2155,12 @@ def _autofix_pr_impl(
             },
             text=str(exc),
         )
-        raise typer.Exit(code=ExitCode.RUN_FAILED)
 
     validation_path = artifacts_dir / "autofix_validation.json"
-    if not validation_path.exists():
-        _emit(
+    try:
+        validation = json.loads(validation_path.read_bytes())
+    except FileNotFoundError:
+        _fail(
             cli_ctx,
             payload={"ok": False, "error": "missing_validation", "run_dir": str(run_dir)},
             text=(
@@ -2144,29 +2169,23 @@ def _autofix_pr_impl(
                 "and retry."
             ),
         )
-        raise typer.Exit(code=ExitCode.RUN_FAILED)
-
-    try:
-        validation = json.loads(validation_path.read_text(encoding="utf-8"))
-    except json.JSONDecodeError:
-        _emit(
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        _fail(
             cli_ctx,
             payload={"ok": False, "error": "invalid_validation_json", "path": str(validation_path)},
             text=f"Invalid JSON: {validation_path}",
         )
-        raise typer.Exit(code=ExitCode.RUN_FAILED)
 
     if validation.get("ok") is not True:
-        _emit(
+        _fail(
             cli_ctx,
             payload={"ok": False, "error": "validation_failed", "validation": validation},
             text="Validation did not pass; refusing to open an upstream PR.",
         )
-        raise typer.Exit(code=ExitCode.RUN_FAILED)
 
     selection = select_paths_to_commit(worktree_path)
     if not selection.paths:
-        _emit(
+        _fail(
             cli_ctx,
             payload={
                 "ok": False,
@@ -2176,9 +2195,10 @@ def _autofix_pr_impl(
             },
             text="No non-ephemeral changes detected in the SDK worktree; nothing to PR.",
         )
-        raise typer.Exit(code=ExitCode.RUN_FAILED)
 
-    profile_obj = record.get("profile") if isinstance(record.get("profile"), dict) else {}
+    profile_obj = record.get("profile")
+    if not isinstance(profile_obj, dict):
+        profile_obj = {}
     profile_name = str(profile_obj.get("name") or "").strip() or None
     run_id = str(record.get("run_id") or "").strip() or None
     model = str(profile_obj.get("model") or "").strip() or None
@@ -2215,11 +2235,7 @@ def _autofix_pr_impl(
     )
     body_path = artifacts_dir / "autofix_upstream_pr_body.md"
     body_path.parent.mkdir(parents=True, exist_ok=True)
-    body_path.write_text(body_text, encoding="utf-8")
-    try:
-        body_path.chmod(0o600)
-    except OSError:
-        pass
+    write_private_text(body_path, body_text)
 
     pr_title = title or commit_message
     record_path = dry_run_record_path if dry_run else pr_record_path
@@ -2236,8 +2252,8 @@ def _autofix_pr_impl(
         "artifacts": {"pr_record_json": str(record_path), "pr_body_md": str(body_path)},
     }
 
+    created_at = _utc_now_iso()
     if dry_run:
-        created_at = datetime.now(timezone.utc).replace(microsecond=0).isoformat()
         write_validation_artifact(
             path=record_path,
             payload={
@@ -2267,7 +2283,7 @@ def _autofix_pr_impl(
         return result_base
 
     if remote_url is None:
-        _emit(
+        _fail(
             cli_ctx,
             payload={"ok": False, "error": "missing_fork_owner", "run_dir": str(run_dir)},
             text=(
@@ -2275,14 +2291,13 @@ def _autofix_pr_impl(
                 "Pass --fork-owner or login to gh."
             ),
         )
-        raise typer.Exit(code=ExitCode.RUN_FAILED)
 
     ensure_remote(worktree_path, remote=push_remote, url=remote_url)
 
     try:
         push_branch(worktree_path, remote=push_remote, branch=branch)
     except AgentSdkError as exc:
-        _emit(
+        _fail(
             cli_ctx,
             payload={
                 "ok": False,
@@ -2297,7 +2312,6 @@ def _autofix_pr_impl(
                 f"  gh pr create --repo {upstream_repo} --base {base} --head {owner}:{branch}\n"
             ),
         )
-        raise typer.Exit(code=ExitCode.RUN_FAILED)
 
     try:
         pr_url = gh_pr_create(
@@ -2310,7 +2324,7 @@ def _autofix_pr_impl(
             draft=draft,
         )
     except AgentSdkError as exc:
-        _emit(
+        _fail(
             cli_ctx,
             payload={
                 "ok": False,
@@ -2327,9 +2341,7 @@ def _autofix_pr_impl(
                 f"--title {json.dumps(pr_title)} --body-file {body_path}\n"
             ),
         )
-        raise typer.Exit(code=ExitCode.RUN_FAILED)
 
-    created_at = datetime.now(timezone.utc).replace(microsecond=0).isoformat()
     write_validation_artifact(
         path=pr_record_path,
         payload={
@@ -2365,21 +2377,13 @@ def _autofix_pr_impl(
 @autofix_app.command("pr")
 def autofix_pr(
     ctx: typer.Context,
-    json_output: bool = typer.Option(
-        False,
-        "--json",
-        help="Emit machine-readable JSON output for this command.",
-    ),
+    json_output: JsonOption = False,
     run: str = typer.Option(
         ...,
         "--run",
         help="Run id or run directory name/prefix to open an upstream PR for.",
     ),
-    runs_dir: str | None = typer.Option(
-        None,
-        "--runs-dir",
-        help="Override runs directory (default: $OH_LLM_RUNS_DIR or ~/.oh-llm/runs).",
-    ),
+    runs_dir: RunsDirOption = None,
     agent_sdk_path: str | None = typer.Option(
         None,
         "--agent-sdk-path",
@@ -2441,24 +2445,9 @@ def autofix_pr(
 ) -> None:
     """Open an upstream PR for fixes made in the agent-sdk worktree."""
     cli_ctx = _ctx_with_json_override(ctx, json_output=json_output)
-    resolved_runs_dir = Path(runs_dir).expanduser() if runs_dir else resolve_runs_dir()
-
-    try:
-        run_dir = resolve_run_dir(resolved_runs_dir, run)
-    except (RunNotFoundError, RunAmbiguousError) as exc:
-        _emit(cli_ctx, payload={"ok": False, "error": str(exc)}, text=str(exc))
-        raise typer.Exit(code=ExitCode.RUN_FAILED)
-
-    record = read_run_record(run_dir)
-    if record is None:
-        _emit(
-            cli_ctx,
-            payload={"ok": False, "error": "run.json missing or corrupt", "run_dir": str(run_dir)},
-            text=f"run.json missing or corrupt in: {run_dir}",
-        )
-        raise typer.Exit(code=ExitCode.RUN_FAILED)
+    run_dir, record = _resolve_run_and_record(cli_ctx, run=run, runs_dir=runs_dir)
 
-    redaction_names = sorted(set([*extract_redact_env(record), *redact_env]))
+    redaction_names = _redaction_names(record, redact_env)
     redactor = redactor_from_env_vars(*redaction_names)
 
     resolved_sdk_path = resolve_agent_sdk_path(Path(agent_sdk_path) if agent_sdk_path else None)
@@ -2502,11 +2491,7 @@ def autofix_pr(
 @app.command()
 def tui(
     ctx: typer.Context,
-    json_output: bool = typer.Option(
-        False,
-        "--json",
-        help="Emit machine-readable JSON output for this command.",
-    ),
+    json_output: JsonOption = False,
 ) -> None:
     """Start the interactive TUI (stub)."""
     cli_ctx = _ctx_with_json_override(ctx, json_output=json_output)
@@ -2521,11 +2506,7 @@ def tui(
 @sdk_app.command("info")
 def sdk_info(
     ctx: typer.Context,
-    json_output: bool = typer.Option(
-        False,
-        "--json",
-        help="Emit machine-readable JSON output for this command.",
-    ),
+    json_output: JsonOption = False,
     path: str | None = typer.Option(
         None,
         "--path",
@@ -2555,11 +2536,7 @@ def sdk_info(
 @sdk_app.command("status")
 def sdk_status(
     ctx: typer.Context,
-    json_output: bool = typer.Option(
-        False,
-        "--json",
-        help="Emit machine-readable JSON output for this command.",
-    ),
+    json_output: JsonOption = False,
     path: str | None = typer.Option(
         None,
         "--path",
@@ -2585,8 +2562,7 @@ def sdk_status(
                 "or set $OH_LLM_AGENT_SDK_PATH."
             ),
         }
-        _emit(cli_ctx, payload=payload, text=f"agent-sdk not found: {agent_sdk_path}")
-        raise typer.Exit(code=ExitCode.RUN_FAILED)
+        _fail(cli_ctx, payload=payload, text=f"agent-sdk not found: {agent_sdk_path}")
 
     if not is_git_repo(agent_sdk_path):
         payload = {
@@ -2597,8 +2573,7 @@ def sdk_status(
             "error": "not_git_repo",
             "hint": "The agent-sdk path must be a git checkout (expected a repo root).",
         }
-        _emit(cli_ctx, payload=payload, text=f"agent-sdk is not a git repo: {agent_sdk_path}")
-        raise typer.Exit(code=ExitCode.RUN_FAILED)
+        _fail(cli_ctx, payload=payload, text=f"agent-sdk is not a git repo: {agent_sdk_path}")
 
     info = collect_agent_sdk_info(agent_sdk_path)
     payload = {
@@ -2615,11 +2590,7 @@ def sdk_status(
 @sdk_app.command("check-import")
 def sdk_check_import(
     ctx: typer.Context,
-    json_output: bool = typer.Option(
-        False,
-        "--json",
-        help="Emit machine-readable JSON output for this command.",
-    ),
+    json_output: JsonOption = False,
     path: str | None = typer.Option(
         None,
         "--path",
@@ -2643,16 +2614,14 @@ def sdk_check_import(
             ],
         )
     except AgentSdkError as exc:
-        _emit(cli_ctx, payload={"ok": False, "error": str(exc)}, text=str(exc))
-        raise typer.Exit(code=ExitCode.RUN_FAILED)
+        _fail(cli_ctx, payload={"ok": False, "error": str(exc)}, text=str(exc))
 
     if proc.returncode != 0:
-        _emit(
+        _fail(
             cli_ctx,
             payload={"ok": False, "stdout": proc.stdout, "stderr": proc.stderr},
             text=(proc.stderr or proc.stdout or "Failed to import SDK."),
         )
-        raise typer.Exit(code=ExitCode.RUN_FAILED)
 
     try:
         result = json.loads(proc.stdout.strip().splitlines()[-1])
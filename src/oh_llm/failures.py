@@ -1,50 +1,78 @@
 from __future__ import annotations
 
+import re
 from typing import Any
 
-
-def _as_str(value: Any) -> str | None:
-    if isinstance(value, str):
-        return value
-    return None
+_CREDENTIAL_MARKERS = (
+    "unauthorized",
+    "invalid api key",
+    "api key invalid",
+    "incorrect api key",
+    "missing api key",
+    "no api key",
+    "authentication",
+    "forbidden",
+    "401",
+    "403",
+)
+_MODEL_MARKERS = ("model_not_found", "no such model", "does not exist", "404")
+_NETWORK_MARKERS = (
+    "api connection error",
+    "connection refused",
+    "name or service not known",
+    "nodename nor servname provided",
+    "timed out",
+    "timeout",
+    "ssl",
+)
+
+
+_CREDENTIAL_HINT = "Check your API key env var and provider credentials."
+_MODEL_HINT = "Check that the model name is correct."
+_NETWORK_HINT = "Check base_url/network connectivity and timeout."
+
+# Exception class names whose text scan result is already fixed, keyed by lowercased bare class
+# name. Only names containing a top-priority (credential) marker qualify: nothing in the message
+# can outrank them, so the lookup returns exactly what the scan below would.
+_EXC_TYPE_CLASSIFICATIONS: dict[str, tuple[str, str]] = {
+    "authenticationerror": ("credential_or_config", _CREDENTIAL_HINT),
+}
+
+
+# Marker groups in priority order; the first group with any hit decides the hint.
+_MARKER_GROUPS: tuple[tuple[str, tuple[str, ...], str], ...] = (
+    ("credential", _CREDENTIAL_MARKERS, _CREDENTIAL_HINT),
+    ("model", _MODEL_MARKERS, _MODEL_HINT),
+    ("network", _NETWORK_MARKERS, _NETWORK_HINT),
+)
+_MARKER_RANK = {name: rank for rank, (name, _markers, _hint) in enumerate(_MARKER_GROUPS)}
+_MARKER_HINTS = tuple(hint for _name, _markers, hint in _MARKER_GROUPS)
+# One scan over the text for every group; named groups tell which group a hit belongs to.
+_MARKER_RE = re.compile(
+    "|".join(
+        f"(?P<{name}>" + "|".join(re.escape(marker) for marker in markers) + ")"
+        for name, markers, _hint in _MARKER_GROUPS
+    )
+)
 
 
 def classify_text(*, exc_type: str | None, message: str | None) -> tuple[str, str]:
+    if exc_type:
+        hit = _EXC_TYPE_CLASSIFICATIONS.get(exc_type.rpartition(".")[2].lower())
+        if hit is not None:
+            return hit
+
     text = f"{exc_type or ''}: {message or ''}".lower()
 
-    credential_markers = [
-        "unauthorized",
-        "invalid api key",
-        "api key invalid",
-        "incorrect api key",
-        "missing api key",
-        "no api key",
-        "authentication",
-        "forbidden",
-        "401",
-        "403",
-    ]
-    if any(marker in text for marker in credential_markers):
-        return (
-            "credential_or_config",
-            "Check your API key env var and provider credentials.",
-        )
-
-    model_markers = ["model_not_found", "no such model", "does not exist", "404"]
-    if any(marker in text for marker in model_markers):
-        return ("credential_or_config", "Check that the model name is correct.")
-
-    network_markers = [
-        "api connection error",
-        "connection refused",
-        "name or service not known",
-        "nodename nor servname provided",
-        "timed out",
-        "timeout",
-        "ssl",
-    ]
-    if any(marker in text for marker in network_markers):
-        return ("credential_or_config", "Check base_url/network connectivity and timeout.")
+    best: int | None = None
+    for match in _MARKER_RE.finditer(text):
+        rank = _MARKER_RANK[match.lastgroup or ""]
+        if best is None or rank < best:
+            best = rank
+            if rank == 0:
+                break
+    if best is not None:
+        return ("credential_or_config", _MARKER_HINTS[best])
 
     return (
         "sdk_or_provider_bug",
@@ -61,20 +89,23 @@ def failure_from_stages(stages: dict[str, Any]) -> dict[str, Any] | None:
     if not isinstance(stages, dict):
         return None
 
-    for stage_key in ["A", "B", "C"]:
+    for stage_key in ("A", "B", "C"):
         stage = stages.get(stage_key)
-        if not isinstance(stage, dict):
-            continue
-        if stage.get("status") != "fail":
+        if not (isinstance(stage, dict) and stage.get("status") == "fail"):
             continue
 
-        error = stage.get("error") if isinstance(stage.get("error"), dict) else {}
-        exc_type = _as_str(error.get("type"))
-        message = _as_str(error.get("message"))
-        hint = _as_str(error.get("hint"))
-
-        classification = _as_str(error.get("classification"))
-        if not classification:
+        error = stage.get("error")
+        if not isinstance(error, dict):
+            error = {}
+        exc_type = error.get("type")
+        exc_type = exc_type if isinstance(exc_type, str) else None
+        message = error.get("message")
+        message = message if isinstance(message, str) else None
+        hint = error.get("hint")
+        hint = hint if isinstance(hint, str) else None
+
+        classification = error.get("classification")
+        if not (classification and isinstance(classification, str)):
             classification, auto_hint = classify_text(exc_type=exc_type, message=message)
             hint = hint or auto_hint
 
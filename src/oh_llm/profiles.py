@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 import json
+import os
 import re
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
@@ -33,12 +35,19 @@ def _ensure_safe_env_var_name(env_var_name: str) -> str:
     return env_var_name
 
 
+@lru_cache(maxsize=8)
+def _profile_dirs_for(home: str | None) -> tuple[Path, Path]:
+    base = Path.home()
+    return base / ".openhands" / "llm-profiles", base / ".oh-llm" / "profiles"
+
+
 def resolve_openhands_profiles_dir() -> Path:
-    return Path.home() / ".openhands" / "llm-profiles"
+    # Keyed on `$HOME` so a changed home is still honored.
+    return _profile_dirs_for(os.environ.get("HOME"))[0]
 
 
 def resolve_oh_llm_profile_metadata_dir() -> Path:
-    return Path.home() / ".oh-llm" / "profiles"
+    return _profile_dirs_for(os.environ.get("HOME"))[1]
 
 
 @dataclass(frozen=True)
@@ -71,22 +80,21 @@ def get_oh_llm_metadata_path(profile_id: str) -> Path:
     return resolve_oh_llm_profile_metadata_dir() / f"{safe_id}.json"
 
 
-def _read_json_file(path: Path) -> dict[str, Any]:
-    return json.loads(path.read_text(encoding="utf-8"))
+def _try_read_json(path: Path) -> dict[str, Any] | None:
+    """Parse `path`, or return `None` if it does not exist."""
+    try:
+        raw = path.read_bytes()
+    except FileNotFoundError:
+        return None
+    return json.loads(raw)
 
 
 def load_openhands_profile(profile_id: str) -> dict[str, Any] | None:
-    path = get_openhands_profile_path(profile_id)
-    if not path.exists():
-        return None
-    return _read_json_file(path)
+    return _try_read_json(get_openhands_profile_path(profile_id))
 
 
 def load_profile_metadata(profile_id: str) -> dict[str, Any] | None:
-    path = get_oh_llm_metadata_path(profile_id)
-    if not path.exists():
-        return None
-    return _read_json_file(path)
+    return _try_read_json(get_oh_llm_metadata_path(profile_id))
 
 
 def write_openhands_profile(
@@ -158,16 +166,12 @@ def update_profile(
     sdk_path = get_openhands_profile_path(safe_id)
     meta_path = get_oh_llm_metadata_path(safe_id)
 
-    sdk_exists = sdk_path.exists()
-    meta_exists = meta_path.exists()
-
-    sdk_payload: dict[str, Any] = {}
-    if sdk_exists:
-        sdk_payload = load_openhands_profile(safe_id) or {}
-
-    meta_payload: dict[str, Any] = {}
-    if meta_exists:
-        meta_payload = load_profile_metadata(safe_id) or {}
+    sdk_loaded = _try_read_json(sdk_path)
+    meta_loaded = _try_read_json(meta_path)
+    sdk_exists = sdk_loaded is not None
+    meta_exists = meta_loaded is not None
+    sdk_payload: dict[str, Any] = sdk_loaded or {}
+    meta_payload: dict[str, Any] = meta_loaded or {}
 
     if not sdk_payload and not meta_payload:
         raise FileNotFoundError(f"Profile not found: {safe_id}")
@@ -210,10 +214,13 @@ def update_profile(
         meta_changed = True
 
     if not sdk_changed and not meta_changed:
-        existing = get_profile(safe_id)
-        if existing is None:
-            raise FileNotFoundError(f"Profile not found: {safe_id}")
-        return existing
+        return _build_profile_record(
+            safe_id,
+            sdk_path=sdk_path,
+            sdk_payload=sdk_loaded,
+            meta_path=meta_path,
+            meta_payload=meta_loaded,
+        )
 
     if sdk_changed:
         if not sdk_payload:
@@ -246,13 +253,13 @@ def update_profile(
         except OSError:
             pass
 
-    return get_profile(safe_id) or ProfileRecord(
-        profile_id=safe_id,
-        model=None,
-        base_url=None,
-        api_key_env=None,
-        sdk_profile_path=sdk_path if sdk_path.exists() else None,
-        metadata_path=meta_path if meta_path.exists() else None,
+    # Build the result from the payloads just written instead of reading them back.
+    return _build_profile_record(
+        safe_id,
+        sdk_path=sdk_path,
+        sdk_payload=sdk_payload if sdk_exists or sdk_changed else None,
+        meta_path=meta_path,
+        meta_payload=meta_payload if meta_exists or meta_changed else None,
     )
 
 
@@ -323,16 +330,48 @@ def _extract_env_var(meta_payload: dict[str, Any]) -> str | None:
     return str(env_var) if env_var is not None else None
 
 
-def list_profiles() -> list[ProfileRecord]:
-    ids: set[str] = set()
+def _json_file_stems(directory: Path) -> set[str]:
+    # One scandir pass; dirent types avoid the per-entry stats `Path.glob` would do.
+    try:
+        with os.scandir(directory) as entries:
+            return {
+                entry.name[:-5]
+                for entry in entries
+                if entry.name.endswith(".json") and entry.is_file()
+            }
+    except (FileNotFoundError, NotADirectoryError):
+        return set()
+
+
+def _build_profile_record(
+    profile_id: str,
+    *,
+    sdk_path: Path,
+    sdk_payload: dict[str, Any] | None,
+    meta_path: Path,
+    meta_payload: dict[str, Any] | None,
+) -> ProfileRecord:
+    model: str | None = None
+    base_url: str | None = None
+    api_key_env: str | None = None
+    if sdk_payload is not None:
+        model, base_url = _extract_llm_fields(sdk_payload)
+    if meta_payload is not None:
+        api_key_env = _extract_env_var(meta_payload)
+
+    return ProfileRecord(
+        profile_id=profile_id,
+        model=model,
+        base_url=base_url,
+        api_key_env=api_key_env,
+        sdk_profile_path=sdk_path if sdk_payload is not None else None,
+        metadata_path=meta_path if meta_payload is not None else None,
+    )
 
-    openhands_dir = resolve_openhands_profiles_dir()
-    if openhands_dir.exists():
-        ids.update(path.stem for path in openhands_dir.glob("*.json"))
 
-    meta_dir = resolve_oh_llm_profile_metadata_dir()
-    if meta_dir.exists():
-        ids.update(path.stem for path in meta_dir.glob("*.json"))
+def list_profiles() -> list[ProfileRecord]:
+    ids = _json_file_stems(resolve_openhands_profiles_dir())
+    ids |= _json_file_stems(resolve_oh_llm_profile_metadata_dir())
 
     records: list[ProfileRecord] = []
     for raw_id in sorted(ids):
@@ -344,26 +383,13 @@ def list_profiles() -> list[ProfileRecord]:
         sdk_path = get_openhands_profile_path(profile_id)
         meta_path = get_oh_llm_metadata_path(profile_id)
 
-        sdk_payload = load_openhands_profile(profile_id) if sdk_path.exists() else None
-        meta_payload = load_profile_metadata(profile_id) if meta_path.exists() else None
-
-        model: str | None = None
-        base_url: str | None = None
-        api_key_env: str | None = None
-
-        if sdk_payload is not None:
-            model, base_url = _extract_llm_fields(sdk_payload)
-        if meta_payload is not None:
-            api_key_env = _extract_env_var(meta_payload)
-
         records.append(
-            ProfileRecord(
-                profile_id=profile_id,
-                model=model,
-                base_url=base_url,
-                api_key_env=api_key_env,
-                sdk_profile_path=sdk_path if sdk_path.exists() else None,
-                metadata_path=meta_path if meta_path.exists() else None,
+            _build_profile_record(
+                profile_id,
+                sdk_path=sdk_path,
+                sdk_payload=_try_read_json(sdk_path),
+                meta_path=meta_path,
+                meta_payload=_try_read_json(meta_path),
             )
         )
     return records
@@ -374,24 +400,14 @@ def get_profile(profile_id: str) -> ProfileRecord | None:
     sdk_path = get_openhands_profile_path(profile_id)
     meta_path = get_oh_llm_metadata_path(profile_id)
 
-    sdk_payload = load_openhands_profile(profile_id) if sdk_path.exists() else None
-    meta_payload = load_profile_metadata(profile_id) if meta_path.exists() else None
+    sdk_payload = _try_read_json(sdk_path)
+    meta_payload = _try_read_json(meta_path)
     if sdk_payload is None and meta_payload is None:
         return None
-
-    model: str | None = None
-    base_url: str | None = None
-    api_key_env: str | None = None
-    if sdk_payload is not None:
-        model, base_url = _extract_llm_fields(sdk_payload)
-    if meta_payload is not None:
-        api_key_env = _extract_env_var(meta_payload)
-
-    return ProfileRecord(
-        profile_id=profile_id,
-        model=model,
-        base_url=base_url,
-        api_key_env=api_key_env,
-        sdk_profile_path=sdk_path if sdk_path.exists() else None,
-        metadata_path=meta_path if meta_path.exists() else None,
+    return _build_profile_record(
+        profile_id,
+        sdk_path=sdk_path,
+        sdk_payload=sdk_payload,
+        meta_path=meta_path,
+        meta_payload=meta_payload,
     )
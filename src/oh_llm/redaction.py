@@ -3,50 +3,75 @@ from __future__ import annotations
 import json
 import os
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Any
 
 REDACTED = "<REDACTED>"
 
-_SECRET_KEY_NAMES = {
-    "api_key",
-    "apikey",
-    "api-key",
-    "authorization",
-    "token",
-    "access_token",
-    "refresh_token",
-    "secret",
-    "password",
-}
+_SECRET_KEY_NAMES = frozenset(
+    {
+        "api_key",
+        "apikey",
+        "api-key",
+        "authorization",
+        "token",
+        "access_token",
+        "refresh_token",
+        "secret",
+        "password",
+    }
+)
+_SECRET_KEY_INITIALS = frozenset(name[0] for name in _SECRET_KEY_NAMES)
+
+
+# Token shapes redacted even without known secret values, in one pass after the secret values.
+# Only the bearer header keeps its prefix.
+_TOKEN_RE = re.compile(
+    r"(?P<bearer>(?i:authorization\s*:\s*bearer))\s+[A-Za-z0-9\-._=+/]+"
+    r"|\bsk-[A-Za-z0-9]{20,}\b"
+)
+
+
+def _token_replacement(match: re.Match[str]) -> str:
+    bearer = match.group("bearer")
+    return REDACTED if bearer is None else f"{bearer} {REDACTED}"
 
 
 def _looks_secret_key_name(key: str) -> bool:
+    # Most keys are ruled out by their first character, without building stripped/lowered copies.
+    first = key[:1]
+    if first.lower() not in _SECRET_KEY_INITIALS and not first.isspace():
+        return False
     return key.strip().lower() in _SECRET_KEY_NAMES
 
 
 @dataclass(frozen=True)
 class Redactor:
     secret_values: tuple[str, ...] = ()
+    _values_re: re.Pattern[str] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        # One pass over the text for all secret values. Longest first, so a secret that contains
+        # another secret is redacted whole rather than leaving its remainder behind.
+        values = sorted({value for value in self.secret_values if value}, key=len, reverse=True)
+        if values:
+            pattern = re.compile("|".join(re.escape(value) for value in values))
+            object.__setattr__(self, "_values_re", pattern)
 
     def redact_text(self, text: str) -> str:
         if not text:
             return text
 
         redacted = text
+        # Known secret values go first and on their own: a token-shape match could otherwise start
+        # earlier and stop at a character outside its class, leaving the rest of a secret behind.
+        if self._values_re is not None:
+            redacted = self._values_re.sub(REDACTED, redacted)
 
-        for value in self.secret_values:
-            if value:
-                redacted = redacted.replace(value, REDACTED)
-
-        redacted = re.sub(
-            r"(?i)(authorization\s*:\s*bearer)\s+[A-Za-z0-9\-._=+/]+",
-            r"\1 " + REDACTED,
-            redacted,
-        )
-        redacted = re.sub(r"\bsk-[A-Za-z0-9]{20,}\b", REDACTED, redacted)
-
-        return redacted
+        return _TOKEN_RE.sub(_token_replacement, redacted)
 
     def redact_obj(self, obj: Any) -> Any:
         if obj is None:
@@ -77,10 +102,23 @@ class Redactor:
         return json.dumps(self.redact_obj(obj), sort_keys=True, indent=2) + "\n"
 
 
+# Frozen, so one empty instance can be shared; key-name and token-shape redaction still apply.
+_NULL_REDACTOR = Redactor()
+
+
 def redactor_from_env_vars(*env_var_names: str) -> Redactor:
     values: list[str] = []
     for name in env_var_names:
         value = os.environ.get(name)
         if value:
             values.append(value)
-    return Redactor(secret_values=tuple(values))
+    if not values:
+        return _NULL_REDACTOR
+    return _redactor_for_values(tuple(values))
+
+
+@lru_cache(maxsize=8)
+def _redactor_for_values(values: tuple[str, ...]) -> Redactor:
+    # Keyed on the secret values (not the env var names) so a changed env never reuses a stale
+    # pattern; autofix commands rebuild the same redactor several times per invocation.
+    return Redactor(secret_values=values)
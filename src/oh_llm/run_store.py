@@ -5,28 +5,39 @@ import os
 import platform
 import socket
 import sys
+import time
 import uuid
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, TextIO
 
 from oh_llm import __version__
 from oh_llm.agent_sdk import AgentSdkError, AgentSdkInfo, get_git_head_sha, is_git_dirty
+from oh_llm.fileio import write_private_text
 from oh_llm.redaction import Redactor
 
+# Same text as `datetime.now(timezone.utc).replace(microsecond=0).isoformat()`, without building
+# a datetime per log line.
+_ISO_UTC_FORMAT = "%Y-%m-%dT%H:%M:%S+00:00"
+
 
 def _utc_now_iso() -> str:
-    return datetime.now(timezone.utc).replace(microsecond=0).isoformat()
+    return time.strftime(_ISO_UTC_FORMAT, time.gmtime())
 
 
-def resolve_runs_dir() -> Path:
-    env = os.environ.get("OH_LLM_RUNS_DIR")
+@lru_cache(maxsize=8)
+def _runs_dir_for(env: str | None, home: str | None) -> Path:
     if env:
         return Path(env).expanduser()
     return Path("~/.oh-llm/runs").expanduser()
 
 
+def resolve_runs_dir() -> Path:
+    # Keyed on the env values so `$OH_LLM_RUNS_DIR` / `$HOME` changes are still honored.
+    return _runs_dir_for(os.environ.get("OH_LLM_RUNS_DIR"), os.environ.get("HOME"))
+
+
 def _slug(value: str) -> str:
     cleaned = []
     for ch in value.strip():
@@ -68,9 +79,9 @@ class RunPaths:
 def create_run_dir(*, runs_dir: Path, profile_name: str | None) -> RunPaths:
     runs_dir.mkdir(parents=True, exist_ok=True)
 
-    now = datetime.now(timezone.utc).replace(microsecond=0)
-    created_at = now.isoformat()
-    timestamp = now.strftime("%Y%m%d_%H%M%S")
+    now = time.gmtime()
+    created_at = time.strftime(_ISO_UTC_FORMAT, now)
+    timestamp = time.strftime("%Y%m%d_%H%M%S", now)
     run_id = _new_run_id()
     suffix = _slug(profile_name or "unknown")
     name = f"{timestamp}_{suffix}_{run_id}"
@@ -95,25 +106,44 @@ def create_run_dir(*, runs_dir: Path, profile_name: str | None) -> RunPaths:
     )
 
 
+# Host and oh-llm install facts are fixed for the life of the process (the latter shells out to
+# git), so they are collected once; callers get a fresh dict since run records are mutated.
+@lru_cache(maxsize=1)
+def _host_info_items() -> tuple[tuple[str, Any], ...]:
+    return (
+        ("hostname", socket.gethostname()),
+        ("platform", platform.platform()),
+        ("python", sys.version.split()[0]),
+        ("executable", sys.executable),
+    )
+
+
 def collect_host_info() -> dict[str, Any]:
-    return {
-        "hostname": socket.gethostname(),
-        "platform": platform.platform(),
-        "python": sys.version.split()[0],
-        "executable": sys.executable,
-    }
+    return dict(_host_info_items())
 
 
-def collect_oh_llm_info() -> dict[str, Any]:
-    info: dict[str, Any] = {"version": __version__}
+@lru_cache(maxsize=1)
+def _oh_llm_info_items() -> tuple[tuple[str, Any], ...]:
     try:
         repo_root = Path(__file__).resolve().parents[2]
-        info["git_sha"] = get_git_head_sha(repo_root)
-        info["git_dirty"] = is_git_dirty(repo_root)
+        git_sha = get_git_head_sha(repo_root)
+        git_dirty = is_git_dirty(repo_root)
     except (OSError, AgentSdkError, IndexError):
-        info["git_sha"] = None
-        info["git_dirty"] = None
-    return info
+        git_sha = None
+        git_dirty = None
+    return (("version", __version__), ("git_sha", git_sha), ("git_dirty", git_dirty))
+
+
+def collect_oh_llm_info() -> dict[str, Any]:
+    return dict(_oh_llm_info_items())
+
+
+def agent_sdk_record(agent_sdk: AgentSdkInfo) -> dict[str, Any]:
+    return {
+        "path": str(agent_sdk.path),
+        "git_sha": agent_sdk.git_sha,
+        "git_dirty": agent_sdk.git_dirty,
+    }
 
 
 def build_run_record(
@@ -123,33 +153,46 @@ def build_run_record(
     profile: dict[str, Any],
     agent_sdk: AgentSdkInfo,
     stages: dict[str, Any],
+    requested: dict[str, Any] | None = None,
 ) -> dict[str, Any]:
-    return {
+    record: dict[str, Any] = {
         "schema_version": 1,
         "run_id": run_id,
         "created_at": created_at,
         "oh_llm": collect_oh_llm_info(),
         "profile": profile,
-        "agent_sdk": {
-            "path": str(agent_sdk.path),
-            "git_sha": agent_sdk.git_sha,
-            "git_dirty": agent_sdk.git_dirty,
-        },
+        "agent_sdk": agent_sdk_record(agent_sdk),
         "host": collect_host_info(),
         "stages": stages,
     }
+    if requested is not None:
+        record["requested"] = requested
+    return record
 
 
 def write_run_json(*, path: Path, run_record: dict[str, Any], redactor: Redactor) -> None:
-    path.write_text(redactor.redact_json(run_record), encoding="utf-8")
+    # Atomic replace: concurrent readers (`runs show`, `runs list`) never see a partial file.
+    write_private_text(path, redactor.redact_json(run_record))
+
+
+def open_log(path: Path) -> TextIO:
+    """Open a run log for buffered appends (0600); pair with `append_log(handle=...)`."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    handle = path.open("a", encoding="utf-8", buffering=64 * 1024)
     try:
         path.chmod(0o600)
     except OSError:
         pass
+    return handle
 
 
-def append_log(*, path: Path, message: str, redactor: Redactor) -> None:
+def append_log(
+    *, path: Path, message: str, redactor: Redactor, handle: TextIO | None = None
+) -> None:
     line = f"[{_utc_now_iso()}] {message}\n"
+    if handle is not None:
+        handle.write(redactor.redact_text(line))
+        return
     path.parent.mkdir(parents=True, exist_ok=True)
     with path.open("a", encoding="utf-8") as handle:
         handle.write(redactor.redact_text(line))
@@ -160,4 +203,4 @@ def append_log(*, path: Path, message: str, redactor: Redactor) -> None:
 
 
 def read_run_json(path: Path) -> dict[str, Any]:
-    return json.loads(path.read_text(encoding="utf-8"))
+    return json.loads(path.read_bytes())
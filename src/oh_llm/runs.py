@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import heapq
 import json
+import os
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
@@ -34,22 +36,76 @@ class RunSummary:
         }
 
 
-def list_run_dirs(runs_dir: Path) -> list[Path]:
-    if not runs_dir.exists():
+_LISTING_CACHE: dict[Path, tuple[tuple[int, int], list[Path]]] = {}
+_RESOLVE_CACHE: dict[tuple[Path, str], tuple[tuple[int, int], Path]] = {}
+
+
+def _dir_stamp(path: Path) -> tuple[int, int] | None:
+    # nlink tracks subdirectory count on POSIX filesystems, covering coarse mtime granularity.
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_nlink)
+
+
+def list_run_dirs(runs_dir: Path, *, limit: int | None = None) -> list[Path]:
+    """Return run dirs newest-first (by name), optionally only the first `limit`."""
+    # Adding, removing, or renaming a run dir changes the parent's stamp, which invalidates the
+    # memoized listing.
+    stamp = _dir_stamp(runs_dir)
+    if stamp is None:
         return []
-    if not runs_dir.is_dir():
+    cached = _LISTING_CACHE.get(runs_dir)
+    if cached is not None and cached[0] == stamp:
+        return cached[1][:limit] if limit is not None else list(cached[1])
+
+    # `DirEntry.is_dir` is answered from readdir's d_type on most filesystems (no stat per entry).
+    try:
+        with os.scandir(runs_dir) as entries:
+            names = [entry.name for entry in entries if entry.is_dir()]
+    except OSError:
         return []
-    run_dirs = [p for p in runs_dir.iterdir() if p.is_dir()]
-    return sorted(run_dirs, key=lambda p: p.name, reverse=True)
+
+    if limit is not None and limit < len(names):
+        return [runs_dir / name for name in heapq.nlargest(limit, names)]
+
+    run_dirs = [runs_dir / name for name in sorted(names, reverse=True)]
+    _LISTING_CACHE[runs_dir] = (stamp, run_dirs)
+    return list(run_dirs)
+
+
+_RECORD_CACHE_MAX = 256
+_RECORD_CACHE: dict[Path, tuple[tuple[int, int, int], bytes]] = {}
 
 
 def read_run_record(run_dir: Path) -> dict[str, Any] | None:
+    """Parse `run_dir/run.json`, caching its bytes per process on the file's (inode, mtime, size).
+
+    Only the immutable bytes are cached; every caller gets its own freshly parsed dict.
+    """
     path = run_dir / "run.json"
-    if not path.exists():
+    try:
+        st = path.stat()
+    except OSError:
         return None
+    key = (st.st_ino, st.st_mtime_ns, st.st_size)
+    cached = _RECORD_CACHE.get(path)
+    if cached is not None and cached[0] == key:
+        raw = cached[1]
+    else:
+        try:
+            raw = path.read_bytes()
+        except OSError:
+            return None
+        if len(_RECORD_CACHE) >= _RECORD_CACHE_MAX:
+            _RECORD_CACHE.clear()
+        _RECORD_CACHE[path] = (key, raw)
+
     try:
-        return json.loads(path.read_text(encoding="utf-8"))
-    except json.JSONDecodeError:
+        # json.loads detects UTF-8 from bytes itself; no separate text decode pass.
+        return json.loads(raw)
+    except (json.JSONDecodeError, UnicodeDecodeError):
         return None
 
 
@@ -70,8 +126,14 @@ def _compute_status(stage_statuses: dict[str, str]) -> str:
 
 
 def summarize_run(run_dir: Path) -> RunSummary:
-    record = read_run_record(run_dir) or {}
-    stages = record.get("stages") if isinstance(record.get("stages"), dict) else {}
+    return summarize_record(run_dir, read_run_record(run_dir) or {})
+
+
+def summarize_record(run_dir: Path, record: dict[str, Any]) -> RunSummary:
+    """Summarize an already-loaded run.json record (see `summarize_run`)."""
+    stages = record.get("stages")
+    if not isinstance(stages, dict):
+        stages = {}
 
     stage_statuses = {
         key: value.get("status")
@@ -88,15 +150,13 @@ def summarize_run(run_dir: Path) -> RunSummary:
         if isinstance(name, str):
             profile_name = name
 
-    run_id = record.get("run_id") if isinstance(record.get("run_id"), str) else None
-    created_at = (
-        record.get("created_at") if isinstance(record.get("created_at"), str) else None
-    )
+    run_id = record.get("run_id")
+    created_at = record.get("created_at")
     status = _compute_status(stage_statuses)
 
     return RunSummary(
-        run_id=run_id,
-        created_at=created_at,
+        run_id=run_id if isinstance(run_id, str) else None,
+        created_at=created_at if isinstance(created_at, str) else None,
         run_dir=run_dir,
         profile_name=profile_name,
         stage_statuses=stage_statuses,
@@ -105,14 +165,37 @@ def summarize_run(run_dir: Path) -> RunSummary:
 
 
 def resolve_run_dir(runs_dir: Path, run_ref: str) -> Path:
-    """Resolve a run reference (run_id or directory name/prefix) to a unique run dir."""
+    """Resolve a run reference (run_id or directory name/prefix) to a unique run dir.
+
+    Successful resolutions are memoized until the runs directory's entries change; failures are
+    never cached.
+    """
     run_ref = (run_ref or "").strip()
     if not run_ref:
         raise RunNotFoundError("Missing run reference.")
 
+    stamp = _dir_stamp(runs_dir)
+    cache_key = (runs_dir, run_ref)
+    cached = _RESOLVE_CACHE.get(cache_key)
+    if stamp is not None and cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    resolved = _resolve_run_dir_uncached(runs_dir, run_ref)
+    if stamp is not None:
+        _RESOLVE_CACHE[cache_key] = (stamp, resolved)
+    return resolved
+
+
+def _resolve_run_dir_uncached(runs_dir: Path, run_ref: str) -> Path:
+    run_dirs = list_run_dirs(runs_dir)
+    # Dir names are unique and an exact name match always wins, so no run.json needs reading.
+    for run_dir in run_dirs:
+        if run_dir.name == run_ref:
+            return run_dir
+
     candidates: list[Path] = []
     records: dict[Path, dict[str, Any] | None] = {}
-    for run_dir in list_run_dirs(runs_dir):
+    for run_dir in run_dirs:
         record = read_run_record(run_dir)
         records[run_dir] = record
 
@@ -131,11 +214,7 @@ def resolve_run_dir(runs_dir: Path, run_ref: str) -> Path:
     if not candidates:
         raise RunNotFoundError(f"Run not found: {run_ref}")
 
-    # Prefer exact name matches, then exact run_id matches, then newest by dir name.
-    exact_name = [c for c in candidates if c.name == run_ref]
-    if len(exact_name) == 1:
-        return exact_name[0]
-
+    # Prefer exact run_id matches, then newest by dir name.
     exact_id = [c for c in candidates if (records.get(c) or {}).get("run_id") == run_ref]
     if len(exact_id) == 1:
         return exact_id[0]
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import json
+import shutil
+import threading
 import time
 from dataclasses import dataclass
 from pathlib import Path
@@ -23,6 +25,18 @@ class StageBOutcome:
     raw: dict[str, Any]
 
 
+_CONFIG_FILENAME = "stage_b_config.json"
+_WORKSPACE_DIRNAME = "stage_b_workspace"
+_PROBE_RESULT_FILENAME = "stage_b_probe_result.json"
+
+
+def discard_stage_b_artifacts(artifacts_dir: Path) -> None:
+    """Remove everything `run_stage_b` writes into `artifacts_dir`, as if it never ran."""
+    for name in (_PROBE_RESULT_FILENAME, _CONFIG_FILENAME):
+        (artifacts_dir / name).unlink(missing_ok=True)
+    shutil.rmtree(artifacts_dir / _WORKSPACE_DIRNAME, ignore_errors=True)
+
+
 def _probe_path() -> Path:
     return Path(__file__).parent / "sdk_probes" / "stage_b_probe.py"
 
@@ -48,6 +62,7 @@ def run_stage_b(
     max_iterations: int,
     terminal_type: str | None,
     redactor: Redactor,
+    cancel: threading.Event | None = None,
 ) -> StageBOutcome:
     problem = agent_sdk_path_problem(agent_sdk_path)
     if problem:
@@ -69,8 +84,8 @@ def run_stage_b(
             raw={"ok": False, "error": error},
         )
 
-    config_path = artifacts_dir / "stage_b_config.json"
-    workspace_dir = artifacts_dir / "stage_b_workspace"
+    config_path = artifacts_dir / _CONFIG_FILENAME
+    workspace_dir = artifacts_dir / _WORKSPACE_DIRNAME
     workspace_dir.mkdir(parents=True, exist_ok=True)
 
     payload: dict[str, Any] = {
@@ -89,6 +104,7 @@ def run_stage_b(
         proc = uv_run_python(
             agent_sdk_path=agent_sdk_path,
             python_args=[str(_probe_path()), "--config", str(config_path)],
+            cancel=cancel,
         )
     except AgentSdkError as exc:
         duration_ms = int((time.monotonic() - started) * 1000)
@@ -114,6 +130,26 @@ def run_stage_b(
         )
 
     duration_ms = int((time.monotonic() - started) * 1000)
+    if cancel is not None and cancel.is_set():
+        # The caller abandoned this run; leave no probe result behind for the capsule to pick up.
+        error = {
+            "type": "Cancelled",
+            "message": "Stage B was cancelled before it finished.",
+            "classification": "sdk_or_provider_bug",
+            "hint": "Re-run without cancelling Stage B.",
+        }
+        return StageBOutcome(
+            ok=False,
+            duration_ms=duration_ms,
+            tool_invoked=False,
+            tool_observed=False,
+            tool_command_preview=None,
+            tool_output_preview=None,
+            final_answer_preview=None,
+            error=error,
+            raw={"ok": False, "error": error},
+        )
+
     raw = _safe_load_json(proc.stdout) or {}
 
     probe_payload: dict[str, Any] = raw or {
@@ -122,7 +158,7 @@ def run_stage_b(
         "stderr": proc.stderr,
         "returncode": proc.returncode,
     }
-    probe_result_path = artifacts_dir / "stage_b_probe_result.json"
+    probe_result_path = artifacts_dir / _PROBE_RESULT_FILENAME
     probe_result_path.write_text(redactor.redact_json(probe_payload), encoding="utf-8")
     try:
         probe_result_path.chmod(0o600)
@@ -9,6 +9,7 @@ from pathlib import Path
 from typing import Any
 
 from oh_llm.agent_sdk import AgentSdkError, get_git_head_sha, is_git_dirty
+from oh_llm.fileio import write_private_text
 
 _BRANCH_SAFE = re.compile(r"[^a-z0-9-]+")
 
@@ -138,12 +139,6 @@ def mark_worktree_cleaned(record: WorktreeRecord) -> WorktreeRecord:
 
 
 def write_worktree_record(path: Path, *, record: WorktreeRecord) -> None:
+    # Atomic replace: a concurrent autofix command never reads a half-written record.
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(
-        json.dumps(record.as_json(), indent=2, ensure_ascii=False) + "\n",
-        encoding="utf-8",
-    )
-    try:
-        path.chmod(0o600)
-    except OSError:
-        pass
+    write_private_text(path, json.dumps(record.as_json(), indent=2, ensure_ascii=False) + "\n")
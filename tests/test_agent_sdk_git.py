@@ -1,12 +1,21 @@
 from __future__ import annotations
 
+import os
 import re
 import subprocess
+import threading
+import time
 from pathlib import Path
 
 import pytest
 
-from oh_llm.agent_sdk import get_git_head_sha, is_git_dirty, resolve_agent_sdk_path
+from oh_llm.agent_sdk import (
+    get_git_head_sha,
+    is_git_dirty,
+    resolve_agent_sdk_path,
+    uv_run_python,
+    which_cached,
+)
 
 
 def _git(repo: Path, *args: str) -> subprocess.CompletedProcess[str]:
@@ -53,3 +62,38 @@ def test_git_sha_and_dirty_detection(tmp_path: Path) -> None:
 
     (repo / "a.txt").write_text("changed\n", encoding="utf-8")
     assert is_git_dirty(repo) is True
+
+
+@pytest.mark.skipif(os.name != "posix", reason="uses an executable shell stub")
+def test_which_cached_does_not_cache_misses(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("PATH", str(tmp_path))
+    assert which_cached("oh-llm-fake-tool") is None
+
+    tool = tmp_path / "oh-llm-fake-tool"
+    tool.write_text("#!/bin/sh\n", encoding="utf-8")
+    tool.chmod(0o755)
+    assert which_cached("oh-llm-fake-tool") == str(tool)
+
+
+@pytest.mark.skipif(os.name != "posix", reason="uses an executable shell stub")
+def test_uv_run_python_cancel_kills_the_process(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    uv = tmp_path / "uv"
+    uv.write_text("#!/bin/sh\nsleep 30\n", encoding="utf-8")
+    uv.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ.get('PATH', '')}")
+
+    cancel = threading.Event()
+    timer = threading.Timer(0.2, cancel.set)
+    timer.start()
+    started = time.monotonic()
+    try:
+        proc = uv_run_python(agent_sdk_path=tmp_path, python_args=["-c", "pass"], cancel=cancel)
+    finally:
+        timer.cancel()
+
+    assert proc.returncode != 0
+    assert time.monotonic() - started < 10
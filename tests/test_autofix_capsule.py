@@ -6,7 +6,9 @@ from pathlib import Path
 import pytest
 from typer.testing import CliRunner
 
+from oh_llm.autofix_capsule import ensure_capsule_artifacts
 from oh_llm.cli import ExitCode, app
+from oh_llm.redaction import Redactor, redactor_from_env_vars
 
 pytestmark = pytest.mark.unit
 
@@ -82,3 +84,108 @@ def test_autofix_capsule_redacts_secrets_from_artifacts(
     assert secret_value not in repro_text
 
     assert "<REDACTED>" in capsule_json_text
+
+
+def test_ensure_capsule_artifacts_reuses_until_inputs_change(tmp_path: Path) -> None:
+    run_dir = _write_run(tmp_path / "runs", dirname="20250102_000000_demo_stamp")
+    (run_dir / "logs" / "run.log").write_text("first\n", encoding="utf-8")
+    record = {"schema_version": 1, "run_id": "run_stamp", "profile": {"name": "demo"}}
+
+    first = ensure_capsule_artifacts(
+        run_dir=run_dir, run_record=record, redactor=Redactor(), redaction_names=[]
+    )
+    stamp_path = run_dir / "artifacts" / "autofix_capsule.stamp"
+    # Every rebuild draws a fresh salt, so an unchanged stamp means the artifacts were reused.
+    stamp = stamp_path.read_text(encoding="utf-8")
+
+    ensure_capsule_artifacts(
+        run_dir=run_dir, run_record=record, redactor=Redactor(), redaction_names=[]
+    )
+    assert stamp_path.read_text(encoding="utf-8") == stamp
+
+    (run_dir / "logs" / "run.log").write_text("first\nsecond line\n", encoding="utf-8")
+    ensure_capsule_artifacts(
+        run_dir=run_dir, run_record=record, redactor=Redactor(), redaction_names=[]
+    )
+    assert "second line" in first.capsule_json.read_text(encoding="utf-8")
+    assert stamp_path.read_text(encoding="utf-8") != stamp
+
+
+def test_ensure_capsule_artifacts_rebuilds_when_redaction_value_appears(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    secret_value = "late-exported-secret"
+    run_dir = _write_run(tmp_path / "runs", dirname="20250104_000000_demo_stamp")
+    (run_dir / "logs" / "run.log").write_text(f"token={secret_value}\n", encoding="utf-8")
+    record = {"schema_version": 1, "run_id": "run_stamp", "profile": {"name": "demo"}}
+
+    monkeypatch.delenv("MY_TOKEN", raising=False)
+    first = ensure_capsule_artifacts(
+        run_dir=run_dir,
+        run_record=record,
+        redactor=redactor_from_env_vars("MY_TOKEN"),
+        redaction_names=["MY_TOKEN"],
+    )
+    assert secret_value in first.capsule_json.read_text(encoding="utf-8")
+
+    monkeypatch.setenv("MY_TOKEN", secret_value)
+    ensure_capsule_artifacts(
+        run_dir=run_dir,
+        run_record=record,
+        redactor=redactor_from_env_vars("MY_TOKEN"),
+        redaction_names=["MY_TOKEN"],
+    )
+    assert secret_value not in first.capsule_json.read_text(encoding="utf-8")
+    assert secret_value not in (run_dir / "artifacts" / "autofix_capsule.stamp").read_text(
+        encoding="utf-8"
+    )
+
+
+def test_ensure_capsule_artifacts_rebuilds_after_artifacts_are_rewritten(tmp_path: Path) -> None:
+    run_dir = _write_run(tmp_path / "runs", dirname="20250105_000000_demo_stamp")
+    (run_dir / "logs" / "run.log").write_text("first\n", encoding="utf-8")
+    record = {"schema_version": 1, "run_id": "run_stamp", "profile": {"name": "demo"}}
+
+    first = ensure_capsule_artifacts(
+        run_dir=run_dir, run_record=record, redactor=Redactor(), redaction_names=[]
+    )
+    first.capsule_json.write_text("sentinel\n", encoding="utf-8")
+
+    ensure_capsule_artifacts(
+        run_dir=run_dir, run_record=record, redactor=Redactor(), redaction_names=[]
+    )
+    assert first.capsule_json.read_text(encoding="utf-8") != "sentinel\n"
+    assert first.capsule_json.stat().st_mode & 0o777 == 0o600
+
+
+def test_ensure_capsule_artifacts_interrupted_rebuild_is_redone(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    run_dir = _write_run(tmp_path / "runs", dirname="20250103_000000_demo_stamp")
+    (run_dir / "logs" / "run.log").write_text("first\n", encoding="utf-8")
+    record = {"schema_version": 1, "run_id": "run_stamp", "profile": {"name": "demo"}}
+
+    first = ensure_capsule_artifacts(
+        run_dir=run_dir, run_record=record, redactor=Redactor(), redaction_names=[]
+    )
+    stamp_path = run_dir / "artifacts" / "autofix_capsule.stamp"
+    assert stamp_path.stat().st_mode & 0o777 == 0o600
+
+    (run_dir / "logs" / "run.log").write_text("first\nsecond line\n", encoding="utf-8")
+
+    def _interrupted(**_kwargs: object) -> None:
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr("oh_llm.autofix_capsule.write_capsule_artifacts", _interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        ensure_capsule_artifacts(
+            run_dir=run_dir, run_record=record, redactor=Redactor(), redaction_names=[]
+        )
+    assert not stamp_path.exists()
+
+    monkeypatch.undo()
+    ensure_capsule_artifacts(
+        run_dir=run_dir, run_record=record, redactor=Redactor(), redaction_names=[]
+    )
+    assert "second line" in first.capsule_json.read_text(encoding="utf-8")
+    assert stamp_path.exists()
@@ -8,6 +8,7 @@ from pathlib import Path
 import pytest
 from typer.testing import CliRunner
 
+from oh_llm.autofix_pr import gh_user_login, select_paths_to_commit
 from oh_llm.cli import ExitCode, app
 
 pytestmark = pytest.mark.unit
@@ -352,6 +353,9 @@ def test_autofix_pr_dry_run_does_not_push_or_create_pr(
 
     pr_record_path = Path(pr_payload["artifacts"]["pr_record_json"])
     assert pr_record_path.name == "autofix_upstream_pr_dry_run.json"
+    assert pr_record_path.stat().st_mode & 0o777 == 0o600
+    body_path = Path(pr_payload["artifacts"]["pr_body_md"])
+    assert body_path.stat().st_mode & 0o777 == 0o600
 
     gh_calls = gh_log.read_text(encoding="utf-8")
     assert "pr create" not in gh_calls
@@ -385,3 +389,36 @@ def test_autofix_pr_refuses_when_validation_missing(
     payload = json.loads(result.stdout)
     assert payload["ok"] is False
     assert payload["error"] == "missing_validation"
+
+
+def test_gh_user_login_is_memoized_per_gh_environment(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    gh_log = tmp_path / "gh.log"
+    fake_bin = tmp_path / "fakebin"
+    fake_bin.mkdir()
+    _write_fake_gh(fake_bin, log_path=gh_log)
+    monkeypatch.setenv("GH_LOG", str(gh_log))
+    monkeypatch.setenv("PATH", f"{fake_bin}{os.pathsep}{os.environ.get('PATH','')}")
+
+    assert gh_user_login(tmp_path) == "testuser"
+    assert gh_user_login(tmp_path) == "testuser"
+    assert gh_log.read_text(encoding="utf-8").count("api user") == 1
+
+
+def test_select_paths_to_commit_keeps_dot_dirs_and_skips_ephemeral(tmp_path: Path) -> None:
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    _git(repo, "init")
+    (repo / "a.txt").write_text("a\n", encoding="utf-8")
+    _git_commit(repo, message="init")
+
+    _git(repo, "mv", "a.txt", "b c.txt")
+    (repo / ".github").mkdir()
+    (repo / ".github" / "ci.yml").write_text("ci\n", encoding="utf-8")
+    (repo / ".pytest_cache").mkdir()
+    (repo / ".pytest_cache" / "x").write_text("x\n", encoding="utf-8")
+
+    selection = select_paths_to_commit(repo)
+    assert selection.paths == (".github/", "a.txt", "b c.txt")
+    assert selection.skipped_ephemeral == (".pytest_cache/",)
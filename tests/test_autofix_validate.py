@@ -187,3 +187,43 @@ def test_autofix_validate_fails_when_stage_b_fails(
     assert result.exit_code == ExitCode.RUN_FAILED
     payload = json.loads(result.stdout)
     assert payload["ok"] is False
+
+
+def test_autofix_validate_parallel_stages_matches_sequential(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("HOME", str(tmp_path))
+    _setup_sdk_repo(tmp_path, monkeypatch)
+
+    secret_env = "TEST_SECRET_ENV"
+    monkeypatch.setenv(secret_env, "super-secret-value")
+
+    runs_dir = tmp_path / "runs"
+    runs_dir.mkdir()
+    run_dir = _write_run(
+        runs_dir,
+        dirname="20250102_000000_demo_para",
+        run_id="run_para123",
+        profile_name="demo",
+        secret_env=secret_env,
+    )
+    _write_repro_script(run_dir / "artifacts", secret_value="super-secret-value", stage_b_ok=False)
+
+    runner = CliRunner()
+    result = runner.invoke(
+        app,
+        [
+            "autofix",
+            "validate",
+            "--run",
+            run_dir.name,
+            "--runs-dir",
+            str(runs_dir),
+            "--parallel-stages",
+            "--json",
+        ],
+    )
+    assert result.exit_code == ExitCode.RUN_FAILED
+    payload = json.loads(result.stdout)
+    summary = json.loads(Path(payload["artifacts"]["validation_json"]).read_text(encoding="utf-8"))
+    assert summary["stages"] == {"a": {"ok": True}, "b": {"ok": False}}
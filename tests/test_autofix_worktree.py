@@ -116,6 +116,8 @@ def test_autofix_worktree_creates_and_cleans_up_by_default(
 
     worktree_record_path = run_dir / "artifacts" / "autofix_worktree.json"
     assert worktree_record_path.exists()
+    assert worktree_record_path.stat().st_mode & 0o777 == 0o600
+    assert not list(worktree_record_path.parent.glob(".autofix_worktree.json.*.tmp"))
 
     branches = _git(sdk_repo, "branch", "--list", branch).stdout.strip().splitlines()
     assert branches == []
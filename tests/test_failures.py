@@ -28,6 +28,33 @@ def test_classify_text_defaults_to_sdk_bug() -> None:
     assert classification == "sdk_or_provider_bug"
 
 
+def test_classify_text_prefers_credential_hint_over_model_hint() -> None:
+    _classification, hint = classify_text(exc_type="APIError", message="401 then 404")
+    assert hint == "Check your API key env var and provider credentials."
+    _classification, hint = classify_text(exc_type="APIError", message="404 after ssl, then 403")
+    assert hint == "Check your API key env var and provider credentials."
+
+
+@pytest.mark.parametrize(
+    ("exc_type", "message", "expected"),
+    [
+        ("openai.AuthenticationError", "Something unexpected", "credential_or_config"),
+        ("openai.APIConnectionError", "Something unexpected", "sdk_or_provider_bug"),
+        ("openai.NotFoundError", "Something unexpected", "sdk_or_provider_bug"),
+    ],
+)
+def test_classify_text_exception_type_matches_text_scan(
+    exc_type: str, message: str, expected: str
+) -> None:
+    classification, _hint = classify_text(exc_type=exc_type, message=message)
+    assert classification == expected
+
+
+def test_classify_text_message_markers_outrank_exception_type() -> None:
+    _classification, hint = classify_text(exc_type="TimeoutError", message="401 Unauthorized")
+    assert hint == "Check your API key env var and provider credentials."
+
+
 def test_failure_from_stages_picks_first_failed_stage() -> None:
     failure = failure_from_stages(
         {
@@ -7,6 +7,7 @@ import pytest
 from typer.testing import CliRunner
 
 from oh_llm.cli import ExitCode, app
+from oh_llm.profiles import resolve_oh_llm_profile_metadata_dir, resolve_openhands_profiles_dir
 
 pytestmark = pytest.mark.unit
 
@@ -188,3 +189,11 @@ def test_profile_list_ignores_invalid_ids(tmp_path: Path, monkeypatch: pytest.Mo
     assert result.exit_code == ExitCode.OK
     payload = json.loads(result.stdout)
     assert payload["profiles"] == []
+
+
+def test_profile_dirs_follow_home_changes(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("HOME", str(tmp_path / "a"))
+    assert resolve_openhands_profiles_dir() == tmp_path / "a" / ".openhands" / "llm-profiles"
+    monkeypatch.setenv("HOME", str(tmp_path / "b"))
+    assert resolve_openhands_profiles_dir() == tmp_path / "b" / ".openhands" / "llm-profiles"
+    assert resolve_oh_llm_profile_metadata_dir() == tmp_path / "b" / ".oh-llm" / "profiles"
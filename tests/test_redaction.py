@@ -5,7 +5,7 @@ from pathlib import Path
 
 import pytest
 
-from oh_llm.redaction import REDACTED, redactor_from_env_vars
+from oh_llm.redaction import REDACTED, Redactor, redactor_from_env_vars
 from oh_llm.run_store import write_run_json
 
 pytestmark = pytest.mark.unit
@@ -61,3 +61,52 @@ def test_write_run_json_redacts_secret_key_names(tmp_path: Path) -> None:
     payload = json.loads(run_json.read_text(encoding="utf-8"))
     assert payload["profile"]["token"] == REDACTED
     assert payload["profile"]["api_key"] == REDACTED
+
+
+def test_redact_text_prefers_longest_overlapping_secret() -> None:
+    redactor = Redactor(secret_values=("abc", "abcdef-long", ""))
+    assert redactor.redact_text("x abcdef-long y abc") == f"x {REDACTED} y {REDACTED}"
+    assert Redactor(secret_values=("abc",)) == Redactor(secret_values=("abc",))
+
+
+@pytest.mark.parametrize(
+    ("secret", "text"),
+    [
+        ("my:secret-value", "Authorization: Bearer my:secret-value"),
+        ("abc def", "authorization: bearer abc def"),
+        ("tok~en123", "Authorization: Bearer tok~en123 rest"),
+    ],
+)
+def test_redact_text_secret_after_bearer_header_never_leaks(secret: str, text: str) -> None:
+    redacted = Redactor(secret_values=(secret,)).redact_text(text)
+    assert REDACTED in redacted
+    for part in secret.replace(":", " ").replace("~", " ").split():
+        assert part not in redacted
+
+
+def test_redact_text_still_redacts_token_shapes_with_secret_values() -> None:
+    redactor = Redactor(secret_values=("supersecret",))
+    text = "authorization: Bearer abc.def; sk-aaaaaaaaaaaaaaaaaaaaaaaa; supersecret"
+    assert redactor.redact_text(text) == (
+        f"authorization: Bearer {REDACTED}; {REDACTED}; {REDACTED}"
+    )
+
+
+def test_redactor_from_env_vars_shares_empty_redactor(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("OH_LLM_TEST_UNSET", raising=False)
+    empty = redactor_from_env_vars("OH_LLM_TEST_UNSET")
+    assert empty is redactor_from_env_vars()
+    assert empty.redact_text("key sk-aaaaaaaaaaaaaaaaaaaaaaaaaaaa") == f"key {REDACTED}"
+
+
+def test_redactor_from_env_vars_reuses_redactor_until_values_change(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("OH_LLM_TEST_SECRET", "first-secret-value")
+    first = redactor_from_env_vars("OH_LLM_TEST_SECRET")
+    assert redactor_from_env_vars("OH_LLM_TEST_SECRET") is first
+
+    monkeypatch.setenv("OH_LLM_TEST_SECRET", "second-secret-value")
+    second = redactor_from_env_vars("OH_LLM_TEST_SECRET")
+    assert second is not first
+    assert second.redact_text("x second-secret-value") == f"x {REDACTED}"
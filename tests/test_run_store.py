@@ -4,6 +4,7 @@ import json
 import os
 import re
 import subprocess
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any
 
@@ -16,9 +17,13 @@ from oh_llm.redaction import REDACTED, redactor_from_env_vars
 from oh_llm.run_store import (
     append_log,
     build_run_record,
+    collect_host_info,
+    collect_oh_llm_info,
     create_run_dir,
     default_stage_template,
+    open_log,
     read_run_json,
+    resolve_runs_dir,
     write_run_json,
 )
 from oh_llm.stage_a import StageAOutcome
@@ -69,6 +74,18 @@ def test_write_run_json_redacts_secret_values_and_keys(
     assert REDACTED in contents
 
 
+def test_write_run_json_replaces_atomically(tmp_path: Path) -> None:
+    run_json = tmp_path / "run.json"
+    redactor = redactor_from_env_vars()
+    write_run_json(path=run_json, run_record={"schema_version": 1, "n": 1}, redactor=redactor)
+    write_run_json(path=run_json, run_record={"schema_version": 1, "n": 2}, redactor=redactor)
+
+    assert read_run_json(run_json)["n"] == 2
+    assert [p.name for p in tmp_path.iterdir()] == ["run.json"]
+    if os.name == "posix":
+        assert (run_json.stat().st_mode & 0o777) == 0o600
+
+
 def test_append_log_redacts_secret_values(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setenv("SECRET_ENV", "supersecret")
     redactor = redactor_from_env_vars("SECRET_ENV")
@@ -88,6 +105,23 @@ def test_append_log_redacts_secret_values(tmp_path: Path, monkeypatch: pytest.Mo
         assert (log_file.stat().st_mode & 0o777) == 0o600
 
 
+def test_append_log_buffers_through_open_handle(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("SECRET_ENV", "supersecret")
+    redactor = redactor_from_env_vars("SECRET_ENV")
+
+    log_file = tmp_path / "logs" / "run.log"
+    with open_log(log_file) as handle:
+        append_log(path=log_file, handle=handle, message="one supersecret", redactor=redactor)
+        append_log(path=log_file, handle=handle, message="two", redactor=redactor)
+
+    lines = log_file.read_text(encoding="utf-8").splitlines()
+    assert [line.split("] ", 1)[1] for line in lines] == [f"one {REDACTED}", "two"]
+    if os.name == "posix":
+        assert (log_file.stat().st_mode & 0o777) == 0o600
+
+
 def test_cli_run_creates_run_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setenv("HOME", str(tmp_path))
     # Create a deterministic, local "agent-sdk" git repo so the run.json can capture a SHA.
@@ -161,6 +195,17 @@ def test_cli_run_creates_run_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch
     assert "not-a-real-key" not in run_json_text
 
 
+def test_resolve_runs_dir_tracks_env_changes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.delenv("OH_LLM_RUNS_DIR", raising=False)
+    assert resolve_runs_dir() == tmp_path / ".oh-llm" / "runs"
+
+    monkeypatch.setenv("OH_LLM_RUNS_DIR", str(tmp_path / "custom"))
+    assert resolve_runs_dir() == tmp_path / "custom"
+
+
 def test_create_run_dir_naming(tmp_path: Path) -> None:
     runs_dir = tmp_path / "runs"
     run = create_run_dir(runs_dir=runs_dir, profile_name="My Profile")
@@ -169,6 +214,14 @@ def test_create_run_dir_naming(tmp_path: Path) -> None:
     assert run.run_id in run.run_dir.name
 
 
+def test_create_run_dir_created_at_matches_dir_timestamp(tmp_path: Path) -> None:
+    run = create_run_dir(runs_dir=tmp_path / "runs", profile_name="demo")
+    created = datetime.fromisoformat(run.created_at)
+    assert created.utcoffset() == timedelta(0)
+    assert created.microsecond == 0
+    assert run.run_dir.name.startswith(created.strftime("%Y%m%d_%H%M%S_"))
+
+
 def test_build_run_record_has_expected_top_level_keys(tmp_path: Path) -> None:
     record = build_run_record(
         run_id="abc123",
@@ -193,3 +246,14 @@ class _AgentSdkInfoLike:
         self.path = path
         self.git_sha = None
         self.git_dirty = None
+
+
+def test_collected_host_and_oh_llm_info_are_fresh_dicts() -> None:
+    host = collect_host_info()
+    host["hostname"] = "mutated"
+    assert collect_host_info()["hostname"] != "mutated"
+
+    info = collect_oh_llm_info()
+    assert info["version"] == __version__
+    info["git_sha"] = "mutated"
+    assert collect_oh_llm_info()["git_sha"] != "mutated"
@@ -7,6 +7,7 @@ import pytest
 from typer.testing import CliRunner
 
 from oh_llm.cli import ExitCode, app
+from oh_llm.runs import RunAmbiguousError, list_run_dirs, read_run_record, resolve_run_dir
 
 pytestmark = pytest.mark.unit
 
@@ -127,3 +128,93 @@ def test_runs_show_corrupt_run_json(tmp_path: Path) -> None:
     payload = json.loads(result.stdout)
     assert payload["ok"] is False
     assert payload["error"] == "run.json corrupt"
+
+
+def test_read_run_record_reflects_rewrites(tmp_path: Path) -> None:
+    run_dir = _write_run(
+        tmp_path / "runs",
+        dirname="20250101_000000_demo_aaaa",
+        run_id="aaaa",
+        created_at="2025-01-01T00:00:00+00:00",
+        stages={"A": {"status": "pass"}},
+    )
+    first = read_run_record(run_dir)
+    assert first is not None
+    first["run_id"] = "mutated by caller"
+    second = read_run_record(run_dir)
+    assert second is not None and second is not first
+    assert second["run_id"] == "aaaa"
+
+    (run_dir / "run.json").write_text(json.dumps({"run_id": "rewritten"}), encoding="utf-8")
+    assert read_run_record(run_dir) == {"run_id": "rewritten"}
+
+    (run_dir / "run.json").unlink()
+    assert read_run_record(run_dir) is None
+
+
+def test_resolve_run_dir_sees_new_runs(tmp_path: Path) -> None:
+    runs_dir = tmp_path / "runs"
+    first = _write_run(
+        runs_dir,
+        dirname="20250101_000000_demo_aaaa",
+        run_id="aaaa",
+        created_at="2025-01-01T00:00:00+00:00",
+        stages={"A": {"status": "pass"}},
+    )
+    assert resolve_run_dir(runs_dir, "2025") == first
+
+    _write_run(
+        runs_dir,
+        dirname="20250102_000000_demo_bbbb",
+        run_id="bbbb",
+        created_at="2025-01-02T00:00:00+00:00",
+        stages={"A": {"status": "pass"}},
+    )
+    with pytest.raises(RunAmbiguousError):
+        resolve_run_dir(runs_dir, "2025")
+
+
+def test_resolve_run_dir_exact_name_skips_run_json_reads(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    runs_dir = tmp_path / "runs"
+    target = _write_run(
+        runs_dir,
+        dirname="20250101_000000_demo_aaaa",
+        run_id="aaaa",
+        created_at="2025-01-01T00:00:00+00:00",
+        stages={"A": {"status": "pass"}},
+    )
+    _write_run(
+        runs_dir,
+        dirname="20250101_000000_demo_aaaa_retry",
+        run_id="bbbb",
+        created_at="2025-01-01T00:00:00+00:00",
+        stages={"A": {"status": "pass"}},
+    )
+
+    def _no_reads(run_dir: Path) -> None:
+        raise AssertionError(f"unexpected run.json read: {run_dir}")
+
+    monkeypatch.setattr("oh_llm.runs.read_run_record", _no_reads)
+    assert resolve_run_dir(runs_dir, target.name) == target
+
+
+def test_list_run_dirs_limit_returns_newest_first(tmp_path: Path) -> None:
+    runs_dir = tmp_path / "runs"
+    for day in ("01", "03", "02"):
+        _write_run(
+            runs_dir,
+            dirname=f"202501{day}_000000_demo_{day}",
+            run_id=f"run_{day}",
+            created_at=f"2025-01-{day}T00:00:00+00:00",
+            stages={"A": {"status": "pass"}},
+        )
+    (runs_dir / "stray.txt").write_text("not a run\n", encoding="utf-8")
+
+    assert [p.name for p in list_run_dirs(runs_dir, limit=2)] == [
+        "20250103_000000_demo_03",
+        "20250102_000000_demo_02",
+    ]
+    assert len(list_run_dirs(runs_dir)) == 3
+    assert [p.name for p in list_run_dirs(runs_dir, limit=1)] == ["20250103_000000_demo_03"]
@@ -85,6 +85,25 @@ def test_run_stage_a_fails_fast_when_api_key_env_missing(
     assert payload["failure"]["classification"] == "credential_or_config"
 
 
+def test_run_config_failure_skips_agent_sdk_git_probe(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("OH_LLM_AGENT_SDK_PATH", str(tmp_path / "agent-sdk"))
+
+    def _unexpected(*args: object, **kwargs: object) -> None:
+        raise AssertionError("collect_agent_sdk_info should not run on config failures")
+
+    monkeypatch.setattr("oh_llm.cli.collect_agent_sdk_info", _unexpected)
+
+    result = CliRunner().invoke(app, ["run", "--runs-dir", str(tmp_path / "runs"), "--json"])
+    assert result.exit_code == ExitCode.RUN_FAILED
+    payload = json.loads(result.stdout)
+    record = read_run_json(Path(payload["run_dir"]) / "run.json")
+    assert record["agent_sdk"]["path"] == str(tmp_path / "agent-sdk")
+    assert record["stages"]["A"]["error"]["message"] == "Missing required option: --profile"
+
+
 def test_run_stage_a_fails_fast_when_agent_sdk_path_invalid(
     tmp_path: Path, monkeypatch: pytest.MonkeyPatch
 ) -> None:
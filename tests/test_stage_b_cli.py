@@ -129,6 +129,125 @@ def test_stage_b_runs_when_enabled(tmp_path: Path, monkeypatch: pytest.MonkeyPat
     assert record["stages"]["B"]["result"]["tool_invoked"] is True
 
 
+def test_stage_b_parallel_stages_records_both(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    _setup_profile(tmp_path, monkeypatch)
+
+    def _fake_stage_a(**kwargs: Any) -> StageAOutcome:
+        return StageAOutcome(
+            ok=True,
+            duration_ms=12,
+            response_preview="Hello",
+            error=None,
+            raw={"ok": True},
+        )
+
+    def _fake_stage_b(**kwargs: Any) -> StageBOutcome:
+        return StageBOutcome(
+            ok=True,
+            duration_ms=34,
+            tool_invoked=True,
+            tool_observed=True,
+            tool_command_preview="echo TOOL_OK",
+            tool_output_preview="TOOL_OK",
+            final_answer_preview="TOOL_OK",
+            error=None,
+            raw={"ok": True},
+        )
+
+    monkeypatch.setattr("oh_llm.cli.run_stage_a", _fake_stage_a)
+    monkeypatch.setattr("oh_llm.cli.run_stage_b", _fake_stage_b)
+
+    runner = CliRunner()
+    result = runner.invoke(
+        app,
+        [
+            "run",
+            "--profile",
+            "demo",
+            "--stage-b",
+            "--parallel-stages",
+            "--runs-dir",
+            str(tmp_path / "runs"),
+            "--json",
+        ],
+    )
+    assert result.exit_code == ExitCode.OK
+    payload = json.loads(result.stdout)
+    record = read_run_json(Path(payload["run_dir"]) / "run.json")
+    assert record["stages"]["A"]["status"] == "pass"
+    assert record["stages"]["B"]["status"] == "pass"
+
+
+def test_stage_b_parallel_stages_stage_a_failure_discards_stage_b(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    _setup_profile(tmp_path, monkeypatch)
+    cancel_seen: list[bool] = []
+
+    def _fake_stage_a(**kwargs: Any) -> StageAOutcome:
+        error = {
+            "type": "AuthenticationError",
+            "message": "invalid api key",
+            "classification": "credential_or_config",
+            "hint": "Check the API key.",
+        }
+        return StageAOutcome(
+            ok=False, duration_ms=12, response_preview=None, error=error, raw={"ok": False}
+        )
+
+    def _fake_stage_b(**kwargs: Any) -> StageBOutcome:
+        artifacts_dir = kwargs["artifacts_dir"]
+        (artifacts_dir / "stage_b_config.json").write_text("{}", encoding="utf-8")
+        (artifacts_dir / "stage_b_workspace").mkdir(exist_ok=True)
+        # A slow provider round-trip that only ends early when the CLI cancels it.
+        cancel_seen.append(kwargs["cancel"].wait(timeout=30))
+        (artifacts_dir / "stage_b_probe_result.json").write_text('{"ok": true}', encoding="utf-8")
+        return StageBOutcome(
+            ok=True,
+            duration_ms=34,
+            tool_invoked=True,
+            tool_observed=True,
+            tool_command_preview="echo TOOL_OK",
+            tool_output_preview="TOOL_OK",
+            final_answer_preview="TOOL_OK",
+            error=None,
+            raw={"ok": True},
+        )
+
+    monkeypatch.setattr("oh_llm.cli.run_stage_a", _fake_stage_a)
+    monkeypatch.setattr("oh_llm.cli.run_stage_b", _fake_stage_b)
+
+    runner = CliRunner()
+    result = runner.invoke(
+        app,
+        [
+            "run",
+            "--profile",
+            "demo",
+            "--stage-b",
+            "--parallel-stages",
+            "--runs-dir",
+            str(tmp_path / "runs"),
+            "--json",
+        ],
+    )
+    assert result.exit_code == ExitCode.RUN_FAILED
+    assert cancel_seen == [True]
+    payload = json.loads(result.stdout)
+    run_dir = Path(payload["run_dir"])
+    record = read_run_json(run_dir / "run.json")
+    assert record["stages"]["A"]["status"] == "fail"
+    assert record["stages"]["B"]["status"] == "not_run"
+    assert record["failure"]["classification"] == "credential_or_config"
+
+    artifacts_dir = run_dir / "artifacts"
+    assert not (artifacts_dir / "stage_b_probe_result.json").exists()
+    assert not (artifacts_dir / "stage_b_config.json").exists()
+    assert not (artifacts_dir / "stage_b_workspace").exists()
+
+
 @pytest.mark.parametrize("mock_mode", ["native", "compat"])
 def test_stage_b_mock_mode_writes_probe_result_contract(
     tmp_path: Path, monkeypatch: pytest.MonkeyPatch, mock_mode: str
@@ -2,12 +2,13 @@ from __future__ import annotations
 
 import json
 import subprocess
+import threading
 from pathlib import Path
 
 import pytest
 
 from oh_llm.redaction import REDACTED, redactor_from_env_vars
-from oh_llm.stage_b import run_stage_b
+from oh_llm.stage_b import discard_stage_b_artifacts, run_stage_b
 
 pytestmark = pytest.mark.unit
 
@@ -184,3 +185,67 @@ def test_stage_b_handles_non_json_probe_stdout_and_redacts_stdout(
     probe_text = (artifacts_dir / "stage_b_probe_result.json").read_text(encoding="utf-8")
     assert secret_value not in probe_text
     assert REDACTED in probe_text
+
+
+def test_stage_b_cancelled_run_writes_no_probe_result(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    artifacts_dir = tmp_path / "artifacts"
+    artifacts_dir.mkdir()
+    sdk_dir = tmp_path / "agent-sdk"
+    _write_fake_agent_sdk(sdk_dir)
+
+    cancel = threading.Event()
+
+    def _fake_uv_run_python(**kwargs: object) -> subprocess.CompletedProcess[str]:
+        assert kwargs["cancel"] is cancel
+        cancel.set()
+        return _proc(stdout=json.dumps({"ok": True}), returncode=-9)
+
+    monkeypatch.setattr("oh_llm.stage_b.uv_run_python", _fake_uv_run_python)
+
+    outcome = run_stage_b(
+        agent_sdk_path=sdk_dir,
+        artifacts_dir=artifacts_dir,
+        model="demo-model",
+        base_url=None,
+        api_key_env="TEST_SECRET_ENV",
+        timeout_s=1,
+        max_iterations=2,
+        terminal_type=None,
+        redactor=redactor_from_env_vars(),
+        cancel=cancel,
+    )
+
+    assert outcome.ok is False
+    assert outcome.error is not None and outcome.error["type"] == "Cancelled"
+    assert not (artifacts_dir / "stage_b_probe_result.json").exists()
+
+
+def test_discard_stage_b_artifacts_removes_everything_stage_b_wrote(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    artifacts_dir = tmp_path / "artifacts"
+    artifacts_dir.mkdir()
+    (artifacts_dir / "stage_a_config.json").write_text("{}", encoding="utf-8")
+    sdk_dir = tmp_path / "agent-sdk"
+    _write_fake_agent_sdk(sdk_dir)
+    monkeypatch.setattr(
+        "oh_llm.stage_b.uv_run_python", lambda **_: _proc(stdout=json.dumps({"ok": True}))
+    )
+
+    run_stage_b(
+        agent_sdk_path=sdk_dir,
+        artifacts_dir=artifacts_dir,
+        model="demo-model",
+        base_url=None,
+        api_key_env="TEST_SECRET_ENV",
+        timeout_s=1,
+        max_iterations=2,
+        terminal_type=None,
+        redactor=redactor_from_env_vars(),
+    )
+    assert (artifacts_dir / "stage_b_probe_result.json").exists()
+
+    discard_stage_b_artifacts(artifacts_dir)
+    assert sorted(path.name for path in artifacts_dir.iterdir()) == ["stage_a_config.json"]